@@ -0,0 +1,55 @@
+"""Memory held for anonymous persons, one entity each vs AnonymousPersons.
+
+Imports a synthetic translations file in which a share of the
+translators and authors are Anon, with and without compact_anonymous,
+and reports the memory held after the import (traced by tracemalloc)
+and the peak over the import and an N-Triples export.
+
+    python -m benchmarks.anonymous [rows] [anon share]
+"""
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from spatrem.importer import Importer
+from benchmarks.synthetic import Shape, write_dataset
+
+ROWS = 3_000
+ANON = 0.5
+
+
+def measure(infile: Path, outdir: Path, **options) -> tuple[float, float, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    importer = Importer(**options)
+    importer.import_translations_file(infile)
+    held = tracemalloc.get_traced_memory()[0]
+    importer.export(outdir, format="nt")
+    peak = tracemalloc.get_traced_memory()[1]
+    seconds = time.perf_counter() - start
+    tracemalloc.stop()
+    return held / 2**20, peak / 2**20, seconds
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    anon = float(sys.argv[2]) if len(sys.argv) > 2 else ANON
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        infile, _ = write_dataset(directory, rows, Shape(anon=anon))
+        print(f"{'':<28} {'held':>9} {'peak':>9} {'time':>8}")
+        for shared_store in (False, True):
+            for compact in (False, True):
+                name = f"{'shared store' if shared_store else 'per entity'}, " \
+                       f"{'compact' if compact else 'one each'}"
+                held, peak, seconds = measure(infile, directory, streaming=True,
+                                              shared_store=shared_store,
+                                              compact_anonymous=compact)
+                print(f"{name:<28} {held:>7.1f}MB {peak:>7.1f}MB {seconds:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
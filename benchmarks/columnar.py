@@ -0,0 +1,43 @@
+"""Rows per second for parsing a translations file by row and by column.
+
+Times turning a synthetic translations csv into TranslationRows: by
+validating each row into a TranslationRecord and parsing its fields
+(plain and with fast_rows), and by reading the file into columns and
+parsing each distinct value once.
+
+    python -m benchmarks.columnar [rows]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+from spatrem.columns import read_translation_rows
+from spatrem.importer import TranslationRecord, read_records, translation_row
+from benchmarks.synthetic import write_dataset
+
+ROWS = 50_000
+
+
+def rate(parse, infile: Path, rows: int) -> float:
+    start = time.perf_counter()
+    for _ in parse(infile):
+        pass
+    return rows / (time.perf_counter() - start)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with tempfile.TemporaryDirectory() as directory:
+        infile, _ = write_dataset(Path(directory), rows)
+        paths = (
+            ("records", lambda f: (translation_row(r) for r in read_records(f, TranslationRecord))),
+            ("records, fast_rows",
+             lambda f: (translation_row(r) for r in read_records(f, TranslationRecord, fast=True))),
+            ("columnar", read_translation_rows),
+        )
+        for name, parse in paths:
+            print(f"{name:<20} {rate(parse, infile, rows):>12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
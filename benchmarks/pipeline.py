@@ -0,0 +1,43 @@
+"""Wall time of a sequential and a pipelined import and export.
+
+Imports a synthetic translations file and exports it as Turtle and as
+N-Triples, once reading and writing on the importing thread and once
+with Importer(pipelined=True).  The overlap pays off on slow storage,
+so point directory at the network mount to measure it there.
+
+    python -m benchmarks.pipeline [rows] [directory]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+from spatrem.importer import Importer
+from benchmarks.synthetic import write_dataset
+
+ROWS = 20_000
+
+
+def run(infile: Path, outdir: Path, format: str, pipelined: bool) -> float:
+    outdir.mkdir(exist_ok=True)
+    start = time.perf_counter()
+    importer = Importer(shared_store=True, columnar=True, pipelined=pipelined)
+    importer.import_translations_file(infile)
+    importer.export(outdir, format=format)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    parent = sys.argv[2] if len(sys.argv) > 2 else None
+    with tempfile.TemporaryDirectory(dir=parent) as directory:
+        directory = Path(directory)
+        infile, _ = write_dataset(directory, rows)
+        for format in ("ttl", "nt"):
+            for pipelined in (False, True):
+                name = f"{format}, {'pipelined' if pipelined else 'sequential'}"
+                seconds = run(infile, directory / name.replace(", ", "-"), format, pipelined)
+                print(f"{name:<20} {seconds:>8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Per-row cost of building a translation as its fan-out grows.
+
+Builds ROWS translations, each with k target languages, k source
+languages and k translators, and reports the time per row and per
+link.  Sub-entities write into their owner's graph once, so the cost
+per link should stay flat as k grows rather than grow with the size
+of the translation's graph.
+
+    python -m benchmarks.row_cost
+"""
+import time
+from spatrem.classes.crm import Language
+from spatrem.classes.magazine import Translation, Original, Translator
+
+ROWS = 500
+FAN_OUT = (1, 2, 4, 8, 16, 32)
+
+
+def build_rows(k: int) -> float:
+    languages = [Language(f"lang{n}") for n in range(k)]
+    translators = [Translator(key=f"t{n}", persName=f"T {n}") for n in range(k)]
+    start = time.perf_counter()
+    for row in range(ROWS):
+        work = Translation(f"title {row}")
+        for lang in languages:
+            work.has_language(lang)
+        original = Original()
+        work.has_original(original)
+        for lang in languages:
+            original.has_language(lang)
+        for translator in translators:
+            work.written_by(translator)
+            translator.wrote(work)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'k':>4} {'us/row':>10} {'us/link':>10}")
+    for k in FAN_OUT:
+        elapsed = build_rows(k)
+        per_row = elapsed / ROWS * 1e6
+        print(f"{k:>4} {per_row:>10.1f} {per_row / (3 * k):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
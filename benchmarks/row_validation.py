@@ -0,0 +1,45 @@
+"""Rows per second for the ways of validating translation csv rows.
+
+Compares TranslationRecord(**row) per row with the batched RowDecoder.
+
+    python -m benchmarks.row_validation
+"""
+import time
+from spatrem.importer import TranslationRecord
+from spatrem.rows import RowDecoder
+
+ROWS = 100_000
+
+
+def rows(n: int) -> list[dict]:
+    return [{"Language_area": "DE", "Journal": f"Journal {i % 20}", "Year": str(1940 + i % 30),
+             "Issue_ID": f"J_{i % 500}", "Vol": str(i % 10), "No": "NONE",
+             "Listed_Translator": "NONE", "Translator": "Hans Müller; Erika Schmidt",
+             "Author": "Anon", "Title": f"Title {i}", "Genre": "Poetry",
+             "SL": "English", "TL": "German", "Notes": "NONE"}
+            for i in range(n)]
+
+
+def rate(decode, data: list[dict], repeat: int = 5) -> float:
+    """The best of repeat runs, as timeit reports."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in decode(data):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return len(data) / best
+
+
+def main() -> None:
+    data = rows(ROWS)
+    paths = (
+        ("pydantic per row", lambda d: (TranslationRecord(**r) for r in d)),
+        ("RowDecoder", RowDecoder(TranslationRecord).decode_all),
+    )
+    for name, decode in paths:
+        print(f"{name:<24} {rate(decode, data):>12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Time looking up translators in an export, from Turtle and from a snapshot.
+
+Exports a synthetic dataset of ROWS rows with a snapshot, then finds
+the E21_Person subjects of the translators category by parsing
+translators.ttl and names.ttl (as import_translators does) and by
+loading the snapshot.
+
+    python -m benchmarks.snapshot_load
+"""
+import tempfile
+import time
+from pathlib import Path
+from rdflib import Graph, RDF
+from spatrem.classes import CRM
+from spatrem.importer import Importer
+from spatrem.snapshot import SNAPSHOT, load_snapshot
+from benchmarks.synthetic import write_dataset
+
+ROWS = 10_000
+
+
+def from_turtle(directory: Path) -> set:
+    graph = Graph()
+    graph.parse(directory / "translators.ttl")
+    graph.parse(directory / "names.ttl")
+    return set(graph.subjects(RDF.type, CRM.E21_Person))
+
+
+def from_snapshot(directory: Path) -> set:
+    snapshot = load_snapshot(directory / SNAPSHOT)
+    return set(snapshot.subjects(RDF.type, CRM.E21_Person, ["translators", "names"]))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        translations_file, translators_file = write_dataset(directory, ROWS)
+        importer = Importer(shared_store=True)
+        importer.import_translations_file(translations_file)
+        importer.import_translators_file(translators_file)
+        importer.export(directory, snapshot=True)
+
+        results = []
+        for name, lookup in (("Turtle", from_turtle), ("snapshot", from_snapshot)):
+            start = time.perf_counter()
+            results.append(lookup(directory))
+            print(f"{name:<10} {time.perf_counter() - start:>8.3f} s")
+        assert results[0] == results[1]
+        size = (directory / SNAPSHOT).stat().st_size
+        print(f"{len(results[0])} persons; snapshot {size / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Start-up time of the command line and of importing the importer.
+
+Runs each command RUNS times in a fresh interpreter and reports the
+best and median wall time.  Orchestration scripts call the CLI many
+times, so this is paid on every call.
+
+    python -m benchmarks.startup
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+RUNS = 10
+COMMANDS = {
+    "python -c pass": [sys.executable, "-c", "pass"],
+    "python main.py --help": [sys.executable, "main.py", "--help"],
+    "import spatrem.importer": [sys.executable, "-c", "import spatrem.importer"],
+}
+
+
+def timings(command: list[str]) -> list[float]:
+    result = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        result.append(time.perf_counter() - start)
+    return result
+
+
+def main() -> None:
+    print(f"{'command':<26} {'best s':>8} {'median s':>10}")
+    for name, command in COMMANDS.items():
+        runs = timings(command)
+        print(f"{name:<26} {min(runs):>8.3f} {statistics.median(runs):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Time the import phases on synthetic data and check for regressions.
+
+For each size, a synthetic dataset (see benchmarks.synthetic) is
+imported in a fresh process, timing import_translations_file,
+import_translators_file and export separately and recording the peak
+resident memory of the process.  The results are compared with the
+baseline in benchmarks/baseline.json and the run fails if any of them
+is more than --tolerance worse.  Timings depend on the machine, so
+the baseline is local: the first run of a size, or a run with --save,
+records it.
+Importer options given on the command line are part of the baseline
+key, so each configuration is compared with itself; --sqlite keeps
+the shared store in a SQLite database in the temporary directory.
+
+    python -m benchmarks.suite --sizes 1000 10000 100000 --shared-store
+"""
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from spatrem.importer import Importer
+from benchmarks.synthetic import write_dataset
+
+BASELINE = Path(__file__).parent / "baseline.json"
+SIZES = (1_000, 10_000, 100_000)
+METRICS = ("translations_s", "translators_s", "export_s", "peak_mb")
+# differences smaller than this (in seconds or MB) are noise
+NOISE = 0.25
+OPTIONS = ("shared_store", "deterministic_ids", "streaming", "fast_rows", "sqlite")
+
+
+def peak_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run(rows: int, options: dict[str, bool], format: str) -> dict[str, float]:
+    """Import and export a synthetic dataset of rows rows."""
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        translations_file, translators_file = write_dataset(directory, rows)
+        options = dict(options)
+        if options.pop("sqlite"):
+            options["sqlite"] = directory / "store.sqlite"
+        importer = Importer(**options)
+
+        start = time.perf_counter()
+        importer.import_translations_file(translations_file)
+        translations_done = time.perf_counter()
+        importer.import_translators_file(translators_file)
+        translators_done = time.perf_counter()
+        importer.export(directory, format=format)
+        export_done = time.perf_counter()
+        importer.close()
+
+    return {"translations_s": translations_done - start,
+            "translators_s": translators_done - translations_done,
+            "export_s": export_done - translators_done,
+            "peak_mb": peak_mb()}
+
+
+def measure(rows: int, options: dict[str, bool], format: str) -> dict[str, float]:
+    # a fresh process per size, so the peak memory is that size's own
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run, rows, options, format).result()
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    found = []
+    for key, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(key, {}).get(metric)
+            if expected and value > max(expected * (1 + tolerance), expected + NOISE):
+                found.append(f"{key} {metric}: {value:.2f} > {expected:.2f}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown or growth as a fraction of the baseline")
+    parser.add_argument("--save", action="store_true", help="record the results as the baseline")
+    parser.add_argument("--format", default="ttl", help="export format: ttl, nt or nq")
+    for option in OPTIONS:
+        parser.add_argument(f"--{option.replace('_', '-')}", action="store_true",
+                            help=f"Importer({option}=True)")
+    args = parser.parse_args()
+    options = {option: getattr(args, option) for option in OPTIONS}
+    config = " ".join([args.format] + [option for option in OPTIONS if options[option]])
+
+    results = {}
+    print(f"{'rows':>8}" + "".join(f"{m:>16}" for m in METRICS))
+    for size in args.sizes:
+        metrics = measure(size, options, args.format)
+        results[f"{size} rows, {config}"] = metrics
+        print(f"{size:>8}" + "".join(f"{metrics[m]:>16.2f}" for m in METRICS))
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    recorded = results if args.save else {k: v for k, v in results.items() if k not in baseline}
+    if recorded:
+        BASELINE.write_text(json.dumps({**baseline, **recorded}, indent=2) + "\n")
+        print(f"baseline for {', '.join(recorded)} saved to {BASELINE}")
+
+    found = regressions(results, baseline, args.tolerance)
+    for regression in found:
+        print(f"regression: {regression}")
+    if found:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Synthetic SpaTrEM csv files for benchmarks.
+
+write_translations writes a ;-delimited translations table shaped like
+the real ones: rows are grouped into issues of a few journals, some
+Translator, Author, SL and TL fields hold several ;-separated values,
+some contributions are Anon, and some titles are reprinted in a later
+issue.  write_translators writes the matching translators table, with
+pseudonyms for some translators and "Missing" sentinels.  The same
+arguments always produce the same files.
+
+    python -m benchmarks.synthetic 10000 /tmp/synthetic
+"""
+import csv
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+TRANSLATION_FIELDS = ["Language_area", "Journal", "Year", "Issue_ID", "Vol", "No",
+                      "Listed_Translator", "Translator", "Author", "Title", "Genre",
+                      "SL", "TL", "Notes"]
+TRANSLATOR_FIELDS = ["Language_area", "Surname_Name", "Pseudonyms", "Year_Birth",
+                     "Year_Death", "Nationality", "Gender", "Journals", "Notes"]
+LANGUAGES = ["English", "French", "German", "Italian", "Spanish", "Russian",
+             "Polish", "Czech", "Latin", "Greek", "Danish", "Swedish"]
+GENRES = ["Poetry", "Prose", "Essay", "Drama"]
+
+
+@dataclass
+class Shape:
+    """The proportions of the generated data."""
+    journals: int = 20
+    rows_per_issue: int = 12
+    translators: int = 2000
+    authors: int = 5000
+    anon: float = 0.1
+    multi_valued: float = 0.15
+    reprints: float = 0.05
+    pseudonyms: float = 0.2
+    area: str = "DE"
+
+
+def several(rng: random.Random, shape: Shape, choices: list[str]) -> str:
+    """One value, or with probability shape.multi_valued two or three."""
+    if rng.random() < shape.multi_valued:
+        return "; ".join(rng.sample(choices, rng.randint(2, 3)))
+    return rng.choice(choices)
+
+
+def person(rng: random.Random, shape: Shape, names: list[str]) -> str:
+    if rng.random() < shape.anon:
+        return "Anon"
+    return several(rng, shape, names)
+
+
+def translation_rows(rows: int, shape: Shape, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    translators = [f"Translator {n}" for n in range(shape.translators)]
+    authors = [f"Author {n}" for n in range(shape.authors)]
+    target = [lang for lang in LANGUAGES if lang != "English"]
+    titles: list[str] = []
+    result = []
+    for n in range(rows):
+        issue = n // shape.rows_per_issue
+        journal = issue % shape.journals
+        volume, number = divmod(issue // shape.journals, 4)
+        if titles and rng.random() < shape.reprints:
+            title = rng.choice(titles)
+        else:
+            title = f"Title {n}"
+            titles.append(title)
+        translator = person(rng, shape, translators)
+        result.append({
+            "Language_area": shape.area,
+            "Journal": f"Journal {journal}",
+            "Year": str(1940 + volume % 40),
+            "Issue_ID": f"J{journal}_{volume}_{number}",
+            "Vol": str(volume + 1),
+            "No": "NONE" if number == 3 else str(number + 1),
+            "Listed_Translator": translator if translator != "Anon" else "NONE",
+            "Translator": translator,
+            "Author": person(rng, shape, authors),
+            "Title": title,
+            "Genre": rng.choice(GENRES),
+            "SL": several(rng, shape, LANGUAGES),
+            "TL": several(rng, shape, target),
+            "Notes": "NONE",
+        })
+    return result
+
+
+def translator_rows(translation_rows: list[dict], shape: Shape, seed: int = 0) -> list[dict]:
+    """A row for every translator named in translation_rows."""
+    rng = random.Random(seed)
+    journals: dict[str, set[str]] = {}
+    for row in translation_rows:
+        for name in row["Translator"].split(";"):
+            if name.strip() != "Anon":
+                journals.setdefault(name.strip(), set()).add(row["Journal"])
+    result = []
+    for name, seen in sorted(journals.items()):
+        pseudonyms = "NONE"
+        if rng.random() < shape.pseudonyms:
+            pseudonyms = "; ".join(f"{name} alias {k}" for k in range(rng.randint(1, 2)))
+        born = rng.randint(1860, 1930)
+        result.append({
+            "Language_area": shape.area,
+            "Surname_Name": name,
+            "Pseudonyms": pseudonyms,
+            "Year_Birth": str(born) if rng.random() < 0.8 else "Missing",
+            "Year_Death": str(born + rng.randint(30, 90)) if rng.random() < 0.6 else "Missing",
+            "Nationality": several(rng, shape, ["German", "Austrian", "Swiss", "Czech"]),
+            "Gender": rng.choice(["Male", "Female", "Missing"]),
+            "Journals": "; ".join(sorted(seen)),
+            "Notes": "NONE",
+        })
+    return result
+
+
+def write_csv(path: Path, fields: list[str], rows: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fields, delimiter=";")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_dataset(directory: Path, rows: int, shape: Shape = Shape(),
+                  seed: int = 0) -> tuple[Path, Path]:
+    """Write <area>_Translations.csv and <area>_Translators.csv into directory."""
+    translations = translation_rows(rows, shape, seed)
+    translations_file = directory / f"{shape.area}_Translations.csv"
+    translators_file = directory / f"{shape.area}_Translators.csv"
+    write_csv(translations_file, TRANSLATION_FIELDS, translations)
+    write_csv(translators_file, TRANSLATOR_FIELDS, translator_rows(translations, shape, seed))
+    return translations_file, translators_file
+
+
+if __name__ == "__main__":
+    write_dataset(Path(sys.argv[2]), int(sys.argv[1]))
@@ -0,0 +1,40 @@
+"""Seconds to write each export category as Turtle, rdflib vs spatrem.turtle.
+
+Imports a synthetic translations file into a shared store and writes
+every category graph with rdflib's serializer and with write_turtle.
+
+    python -m benchmarks.turtle [rows]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+from spatrem.importer import Importer
+from spatrem.turtle import write_turtle
+from benchmarks.synthetic import write_dataset
+
+ROWS = 10_000
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        infile, _ = write_dataset(directory, rows)
+        importer = Importer(shared_store=True, columnar=True)
+        importer.import_translations_file(infile)
+        print(f"{'category':<14} {'triples':>9} {'rdflib':>9} {'spatrem':>9}")
+        for category in importer.categories():
+            graph = importer.store.graph(category)
+            start = time.perf_counter()
+            graph.serialize(destination=directory / "rdflib.ttl")
+            rdflib = time.perf_counter() - start
+            start = time.perf_counter()
+            with open(directory / "spatrem.ttl", mode="w", encoding="utf-8") as out:
+                write_turtle(out, graph)
+            spatrem = time.perf_counter() - start
+            print(f"{category:<14} {len(graph):>9} {rdflib:>8.2f}s {spatrem:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
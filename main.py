@@ -1,6 +1,12 @@
+from enum import Enum
 from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Optional
 import typer
-from spatrem.importer import Importer
+
+# the spatrem modules pull in rdflib and pydantic, so they are imported
+# by the commands that need them rather than on every start
+if TYPE_CHECKING:
+    from spatrem.importer import Importer
 
 
 
@@ -8,24 +14,153 @@ from spatrem.importer import Importer
 app = typer.Typer(help="Spatrem CV parser")
 
 
+def report_stats(importer: "Importer", show: bool, json_file: Optional[Path]) -> None:
+    if show:
+        print(importer.stats.report())
+    if json_file:
+        importer.stats.write_json(json_file)
+
+
+# typer evaluates the annotations of callbacks, so the return type
+# (Optional[ShardSize]) is left off rather than importing spatrem.shards
+def parse_shard_size(value: Optional[str]):
+    if value is None:
+        return None
+    from spatrem.shards import ShardSize
+    try:
+        return ShardSize.parse(value)
+    except ValueError as error:
+        raise typer.BadParameter(str(error))
+
+
+class Format(str, Enum):
+    ttl = "ttl"
+    nt = "nt"
+    nq = "nq"
+
+
+# the options shared by the import commands
+SharedStoreOption = Annotated[bool, typer.Option(help="Keep all triples in one shared store.")]
+FormatOption = Annotated[Format, typer.Option(help="Output format.")]
+JobsOption = Annotated[int, typer.Option(help="Serialize output files in this many processes.")]
+DeterministicIdsOption = Annotated[bool, typer.Option(help="Derive IRIs from stable keys instead of random ids.")]
+StreamingOption = Annotated[bool, typer.Option(help="Build entities row by row without keeping the records.")]
+FastRowsOption = Annotated[bool, typer.Option(help="Validate rows in batches.")]
+StatsOption = Annotated[bool, typer.Option(help="Print where the time went and what was built.")]
+StatsJsonOption = Annotated[Optional[Path], typer.Option(help="Write the stats to this JSON file.")]
+SnapshotOption = Annotated[bool, typer.Option(help="Also write a binary snapshot of the export.")]
+SQLiteOption = Annotated[Optional[Path], typer.Option(help="Keep the shared store in this SQLite database instead of in memory.")]
+PipelinedOption = Annotated[bool, typer.Option(help="Read and write files in background threads while entities are built.")]
+ShardSizeOption = Annotated[Optional[str], typer.Option(callback=parse_shard_size, help="Split each category into shards of this many triples (500000) or bytes (64MB), with a manifest.")]
+FastTurtleOption = Annotated[bool, typer.Option(help="Write Turtle with the spatrem writer instead of rdflib's serializer.")]
+CompactAnonymousOption = Annotated[bool, typer.Option(help="Keep anonymous translators and authors compactly instead of one entity each.")]
+
+
 @app.command()
-def process_translations_file(filename: str, outdirname: str) -> None:
+def process_translations_file(filename: str, outdirname: str,
+                              shared_store: SharedStoreOption = False,
+                              sqlite: SQLiteOption = None,
+                              deterministic_ids: DeterministicIdsOption = False,
+                              streaming: StreamingOption = False,
+                              fast_rows: FastRowsOption = False,
+                              columnar: bool = typer.Option(False, help="Read translation files column by column, parsing each distinct value once."),
+                              pipelined: PipelinedOption = False,
+                              compact_anonymous: CompactAnonymousOption = False,
+                              format: FormatOption = Format.ttl,
+                              fast_turtle: FastTurtleOption = False,
+                              jobs: JobsOption = 1,
+                              snapshot: SnapshotOption = False,
+                              shard_size: ShardSizeOption = None,
+                              aggregates: bool = typer.Option(False, help="Also write counts of translations per journal, year, language pair and translator."),
+                              stats: StatsOption = False,
+                              stats_json: StatsJsonOption = None) -> None:
+    from spatrem.importer import Importer
+
     infile = Path(filename)
     outdir = Path(outdirname)
 
-    importer = Importer()
+    importer = Importer(shared_store=shared_store, deterministic_ids=deterministic_ids,
+                        streaming=streaming, fast_rows=fast_rows,
+                        stats=stats or stats_json is not None, sqlite=sqlite,
+                        aggregates=aggregates, columnar=columnar,
+                        pipelined=pipelined, compact_anonymous=compact_anonymous)
     importer.import_translations_file(infile)
-    importer.export(outdir)
+    importer.export(outdir, format=format.value, jobs=jobs, snapshot=snapshot, shard_size=shard_size,
+                    fast_turtle=fast_turtle)
+    report_stats(importer, stats, stats_json)
+    importer.close()
 
 @app.command()
-def process_translators_file(filename: str, outdirname: str) -> None:
+def process_translators_file(filename: str, outdirname: str,
+                             shared_store: SharedStoreOption = False,
+                             sqlite: SQLiteOption = None,
+                             deterministic_ids: DeterministicIdsOption = False,
+                             streaming: StreamingOption = False,
+                             fast_rows: FastRowsOption = False,
+                             pipelined: PipelinedOption = False,
+                             compact_anonymous: CompactAnonymousOption = False,
+                             join_translators: bool = typer.Option(False, help="Match translator records by normalized name and pseudonym, and report misses."),
+                             format: FormatOption = Format.ttl,
+                             fast_turtle: FastTurtleOption = False,
+                             jobs: JobsOption = 1,
+                             snapshot: SnapshotOption = False,
+                             shard_size: ShardSizeOption = None,
+                             stats: StatsOption = False,
+                             stats_json: StatsJsonOption = None) -> None:
+    from spatrem.importer import Importer
+
     infile = Path(filename)
     outdir = Path(outdirname)
 
-    importer = Importer()
+    importer = Importer(shared_store=shared_store, deterministic_ids=deterministic_ids,
+                        streaming=streaming, fast_rows=fast_rows,
+                        stats=stats or stats_json is not None, sqlite=sqlite,
+                        pipelined=pipelined, compact_anonymous=compact_anonymous,
+                        join_translators=join_translators)
     importer.import_translators_file(infile)
-    importer.export(outdir)
+    if importer.translator_join:
+        print(importer.translator_join.report.summary())
+    importer.export(outdir, format=format.value, jobs=jobs, snapshot=snapshot, shard_size=shard_size,
+                    fast_turtle=fast_turtle)
+    report_stats(importer, stats, stats_json)
+    importer.close()
+
+@app.command()
+def process_directory(dirname: str, outdirname: str,
+                      fast_rows: FastRowsOption = False,
+                      format: FormatOption = Format.ttl,
+                      jobs: int = typer.Option(1, help="Import language areas and serialize output files in this many processes.")) -> None:
+    """Import every <area>_Translations.csv/<area>_Translators.csv pair in dirname into one dataset."""
+    from spatrem.areas import AreaImport
+
+    areas = AreaImport(Path(dirname), jobs=jobs, fast_rows=fast_rows)
+    areas.run()
+    areas.export(Path(outdirname), format=format.value, jobs=jobs)
+
+@app.command()
+def update(filename: str, translatorsfilename: str, outdirname: str) -> None:
+    """Re-import only the rows that changed since the last update of outdirname."""
+    from spatrem.incremental import IncrementalBuild
+
+    build = IncrementalBuild(Path(outdirname))
+    report = build.run(Path(filename), Path(translatorsfilename))
+    print(f"{report.replayed} rows imported, {report.reused} unchanged, "
+          f"{report.removed} removed; rewrote {', '.join(report.rewritten) or 'nothing'}")
+
+@app.command()
+def validate(dirname: str) -> None:
+    """Check that the export in dirname links every entity as the spatrem model requires.
+
+    N-Triples and N-Quads files are streamed, but each Turtle file is
+    read into memory whole, so export large datasets with --format nt
+    or nq to validate them.
+    """
+    from spatrem.validation import validate_directory
 
+    report = validate_directory(Path(dirname))
+    print(report.summary())
+    if not report.ok:
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""Aggregate counts of translations, collected during an import.
+
+Aggregates keeps dictionary-encoded integer columns, appended to as
+translation records are imported: journal and year per translation
+row, source and target language per language pair of a row, and
+translator per translator of a row.  The translators file adds each
+translator's genders and nationalities.  When the counts are written,
+each table is one grouping pass over its columns:
+
+    translations per journal and year
+    translations per language pair
+    translations per translator gender
+    translations per translator nationality
+
+A row naming two translators counts once for each of them in the
+gender and nationality tables, and a row with several source or
+target languages counts once for each pair.  Translators missing from
+the translators file are counted as "Unknown".
+"""
+import csv
+import json
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+AGGREGATES = "aggregates.json"
+UNKNOWN = "Unknown"
+
+
+class Dictionary:
+    """Integer codes for the distinct values of a column."""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class Aggregates:
+    def __init__(self) -> None:
+        self.journals = Dictionary()
+        self.years = Dictionary()
+        self.languages = Dictionary()
+        self.translators = Dictionary()
+        self.journal = array("I")
+        self.year = array("I")
+        self.sl = array("I")
+        self.tl = array("I")
+        self.translator = array("I")
+        self.genders: dict[int, list[str]] = {}
+        self.nationalities: dict[int, list[str]] = {}
+
+    def add_translation(self, journal: str, year: Optional[str], sl: list[str],
+                        tl: list[str], translators: list[str]) -> None:
+        self.journal.append(self.journals.encode(journal))
+        self.year.append(self.years.encode(year or "NONE"))
+        for source in sl:
+            for target in tl:
+                self.sl.append(self.languages.encode(source))
+                self.tl.append(self.languages.encode(target))
+        for key in translators:
+            self.translator.append(self.translators.encode(key))
+
+    def add_translator(self, key: str, genders: list[str], nationalities: list[str]) -> None:
+        code = self.translators.encode(key)
+        self.genders[code] = genders
+        self.nationalities[code] = nationalities
+
+    def per_journal_year(self) -> list[tuple[str, str, int]]:
+        journals, years = self.journals.values, self.years.values
+        counts = Counter(zip(self.journal, self.year))
+        return sorted((journals[j], years[y], n) for (j, y), n in counts.items())
+
+    def per_language_pair(self) -> list[tuple[str, str, int]]:
+        languages = self.languages.values
+        counts = Counter(zip(self.sl, self.tl))
+        return sorted((languages[s], languages[t], n) for (s, t), n in counts.items())
+
+    def _per_translator(self, attribute: dict[int, list[str]]) -> list[tuple[str, int]]:
+        result: Counter = Counter()
+        for code, n in Counter(self.translator).items():
+            for value in attribute.get(code, [UNKNOWN]):
+                result[value] += n
+        return sorted(result.items())
+
+    def per_gender(self) -> list[tuple[str, int]]:
+        return self._per_translator(self.genders)
+
+    def per_nationality(self) -> list[tuple[str, int]]:
+        return self._per_translator(self.nationalities)
+
+    def tables(self) -> dict[str, tuple[list[str], list[tuple]]]:
+        """Each aggregate table's header and rows, keyed by table name."""
+        return {
+            "translations_per_journal_year": (["Journal", "Year", "Translations"],
+                                              self.per_journal_year()),
+            "translations_per_language_pair": (["SL", "TL", "Translations"],
+                                               self.per_language_pair()),
+            "translations_per_translator_gender": (["Gender", "Translations"],
+                                                   self.per_gender()),
+            "translations_per_translator_nationality": (["Nationality", "Translations"],
+                                                        self.per_nationality()),
+        }
+
+    def write(self, directory: Path) -> None:
+        """Write each table as a ;-delimited csv file, and all of them as JSON."""
+        tables = self.tables()
+        for name, (header, rows) in tables.items():
+            with open(directory / f"{name}.csv", "w", encoding="utf-8", newline="") as out:
+                writer = csv.writer(out, delimiter=";")
+                writer.writerow(header)
+                writer.writerows(rows)
+        document = {name: [dict(zip(header, row)) for row in rows]
+                    for name, (header, rows) in tables.items()}
+        (directory / AGGREGATES).write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n",
+                                            encoding="utf-8")
@@ -0,0 +1,152 @@
+"""Import the csv files of several language areas into one dataset.
+
+The SpaTrEM data comes as a translations and a translators file per
+language area (DE_Translations.csv, DE_Translators.csv, ...).  The
+translations file of each area is imported by its own Importer in a
+worker process, and the triples of every area are then merged into one
+set of category graphs.
+
+The workers use deterministic IRIs, so an entity keyed by the same
+clean_id in two areas (a journal, language, name, translator or
+author) has the same IRI in both, and merging the areas' triples
+deduplicates it.  Anonymous persons stay distinct, as their keys
+include the issue they appear in.  The translators files are imported
+after the merge, in one Importer that knows the translators and names
+of every area, so a translator listed in another area's translations
+is enriched as in a single import.
+"""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+from rdflib import Graph
+from spatrem.classes.base_graph import category_id, deterministic_ids, new_graph
+from spatrem.classes.crm import Nomen
+from spatrem.classes.magazine import Translator
+from spatrem.exporter import check_format, serialize_in_parallel, stream_graphs
+from spatrem.importer import Importer
+
+AREA_FILE = re.compile(r"(?P<area>.+)_(?P<kind>Translations|Translators)\.csv")
+
+
+def find_areas(directory: Path) -> dict[str, tuple[Path, Optional[Path]]]:
+    """Map each language area in directory to its translations and translators files."""
+    files: dict[str, dict[str, Path]] = {}
+    for path in sorted(directory.iterdir()):
+        match = AREA_FILE.fullmatch(path.name)
+        if match:
+            files.setdefault(match["area"], {})[match["kind"]] = path
+    return {area: (kinds["Translations"], kinds.get("Translators"))
+            for area, kinds in files.items() if "Translations" in kinds}
+
+
+def area_importer(fast_rows: bool = False) -> Importer:
+    return Importer(shared_store=True, deterministic_ids=True, streaming=True,
+                    fast_rows=fast_rows)
+
+
+def category_triples(importer: Importer) -> dict[str, list]:
+    return {category: list(importer.store.graph(category))
+            for category in importer.categories()}
+
+
+def import_area(translations_file: Path,
+                fast_rows: bool = False) -> tuple[dict[str, list], dict[str, str], set[str]]:
+    """Import one language area's translations.
+
+    Returns its triples by export category, the names of its
+    translators by clean_id and the clean_ids of its names.
+    """
+    importer = area_importer(fast_rows)
+    importer.import_translations_file(translations_file)
+    translators = {key: translator.label for key, translator in importer.translators.items()
+                   if isinstance(translator, Translator)}
+    return category_triples(importer), translators, set(importer.nomena)
+
+
+def import_translators(files: list[Path], translators: dict[str, str], names: set[str],
+                       fast_rows: bool = False) -> dict[str, list]:
+    """Import translators files against the translators and names of all areas.
+
+    Returns the triples of the import by export category.  The known
+    translators are built again, with the same triples, so that the
+    records' attributes can be added to them; the known names are only
+    looked up, so they are built outside the store.
+    """
+    importer = area_importer(fast_rows)
+    with deterministic_ids():
+        importer.nomena.update((key, Nomen(key, iri_key=key)) for key in names)
+    with importer.building():
+        importer.translators.update((key, Translator(key=key, persName=name))
+                                    for key, name in translators.items())
+    for path in files:
+        importer.import_translators_file(path)
+    return category_triples(importer)
+
+
+class AreaImport:
+    """Import every language area found in a directory and merge them."""
+
+    def __init__(self, directory: Path, jobs: int = 1, fast_rows: bool = False) -> None:
+        if not directory.is_dir():
+            raise OSError("directory not found")
+        self.areas = find_areas(directory)
+        self.jobs = jobs
+        self.fast_rows = fast_rows
+        self.graphs: dict[str, Graph] = {}
+        # the translators (by clean_id) and names of the merged areas
+        self.translators: dict[str, str] = {}
+        self.names: set[str] = set()
+
+    def run(self) -> dict[str, Graph]:
+        """Import the areas, jobs at a time, and merge them into self.graphs.
+
+        The translators files are imported once every area is merged.
+        """
+        files = [translations for translations, _ in self.areas.values()]
+        if self.jobs > 1 and len(files) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(files))) as pool:
+                for result in pool.map(import_area, files, [self.fast_rows] * len(files)):
+                    self.merge_area(*result)
+        else:
+            for path in files:
+                self.merge_area(*import_area(path, self.fast_rows))
+        translators_files = [path for _, path in self.areas.values() if path]
+        if translators_files:
+            self.merge(import_translators(translators_files, self.translators, self.names,
+                                          self.fast_rows))
+        return self.graphs
+
+    def merge_area(self, triples: dict[str, list], translators: dict[str, str],
+                   names: set[str]) -> None:
+        """Merge one area's triples, and its translators and names into the index."""
+        self.merge(triples)
+        for key, name in translators.items():
+            self.translators.setdefault(key, name)
+        self.names |= names
+
+    def merge(self, triples: dict[str, list]) -> None:
+        """Add one area's triples to the merged category graphs."""
+        for category, category_triples in triples.items():
+            if category not in self.graphs:
+                self.graphs[category] = new_graph()
+            graph = self.graphs[category]
+            graph.addN((s, p, o, graph) for s, p, o in category_triples)
+
+    def export(self, directory: Path, format: str = "ttl", jobs: int = 1) -> None:
+        """Write the merged categories into directory, as Importer.export does."""
+        check_format(format)
+        if not directory.is_dir():
+            raise OSError("directory not found")
+
+        if format in ("nt", "nq"):
+            for category, graph in self.graphs.items():
+                context = category_id(category) if format == "nq" else None
+                stream_graphs(directory / f"{category}.{format}", [graph], context)
+        elif jobs > 1:
+            serialize_in_parallel(
+                {directory / f"{category}.ttl": g for category, g in self.graphs.items()},
+                jobs)
+        else:
+            for category, g in self.graphs.items():
+                g.serialize(destination=directory / f"{category}.ttl")
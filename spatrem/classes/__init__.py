@@ -1,4 +1,4 @@
-from rdflib import Namespace
+from spatrem.classes.terms import Namespace
 
 LRM = Namespace("http://iflastandards.info/ns/lrm/lrmer/")
 CRM = Namespace("http://www.cidoc-crm.org/cidoc-crm/")
@@ -1,11 +1,15 @@
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, Optional
 from rdflib import Graph, Namespace
+from rdflib.plugins.stores.memory import Memory
+from rdflib.store import Store
 from rdflib.term import URIRef, Literal
 from rdflib.namespace._RDF import RDF
 from rdflib.namespace._RDFS import RDFS
 from rdflib.namespace._XSD import XSD
 import shortuuid
 from spatrem.classes import LANGUAGES, LRM, CRM, SCHEMA, DCTERMS, SPATREM, NAMES, TYPES, PEOPLE
+from spatrem.classes.terms import literal
 
 # LRM = Namespace("http://iflastandards.info/ns/lrm/lrmer/")
 # CRM = Namespace("http://www.cidoc-crm.org/cidoc-crm/")
@@ -26,19 +30,62 @@ class BaseGraph:
         "type": TYPES,
         "person": PEOPLE,
     }
+
+    # The export category an entity's triples belong to when a
+    # SharedStore is active (see SharedStore.graph).
+    category: str = "default"
+    shared_store: Optional["SharedStore"] = None
+    # When set, IRIs are derived from iri_key rather than drawn at
+    # random (see deterministic_ids).
+    deterministic: bool = False
+
     def __init__(self, label: Optional[str] = None,
-                 namespace:str  = "spatrem") -> None:
-        self.graph: Graph = Graph()
-        for k, v in self.spatrem_namespaces.items():
-            self.graph.bind(k, v)
-        ns = self.spatrem_namespaces[namespace]
-        self.id = ns[shortuuid.uuid()]
+                 namespace:str  = "spatrem",
+                 owner: Optional["BaseGraph"] = None,
+                 iri_key: Optional[str] = None) -> None:
+        self.graph: Graph = self._new_graph(owner)
+        if iri_key is None:
+            iri_key = label
+            if owner is not None and owner.iri_key is not None:
+                iri_key = f"{owner.__class__.__name__}/{owner.iri_key}"
+        self.iri_key = iri_key
+        self.id = self._mint_id(namespace, iri_key)
         if label:
             self.label = label
             self.graph.add((self.id, RDFS.label, Literal(label)))
         else:
             self.label = None
+
+    def _new_graph(self, owner: Optional["BaseGraph"] = None) -> Graph:
+        """Return the graph this entity writes its triples into.
+
+        Hidden sub-entities (an owner's Expression or WorkCreation)
+        write straight into their owner's graph, so their triples are
+        added exactly once and never have to be merged back.  Other
+        entities write into their category's graph when a shared store
+        is active, and into a graph of their own otherwise.
+        """
+        if owner is not None:
+            return owner.graph
+        store = BaseGraph.shared_store
+        if store is None:
+            return new_graph()
+        return store.graph(self.category)
     
+    @classmethod
+    def _mint_id(cls, namespace: str, iri_key: Optional[str]) -> URIRef:
+        """Mint the IRI of an entity of this class in namespace.
+
+        In deterministic mode the IRI is a name-based uuid of the
+        namespace, class and iri_key, so the same input always yields
+        the same IRI; otherwise it is random.
+        """
+        ns = cls.spatrem_namespaces[namespace]
+        if cls.deterministic and iri_key is not None:
+            name = f"{namespace}/{cls.__name__}/{iri_key}"
+            return ns[shortuuid.uuid(name=name)]
+        return ns[shortuuid.uuid()]
+
     def __repr__(self) -> str:
         if self.label:
             return f"<{self.__class__.__name__}: {self.label}>"
@@ -49,18 +96,94 @@ class BaseGraph:
     def __str__(self) -> str:
         return self.graph.serialize()
 
+    def merge(self, other: "BaseGraph") -> None:
+        """Add other's triples to this entity's graph.
+
+        A no-op when both already write into the same graph.
+        """
+        if other.graph is not self.graph:
+            self.graph += other.graph
+
     def has_identifier(self, identifier: str) -> None:
-        self.graph.add((self.id, DCTERMS.identifier, Literal(identifier)))
+        self.graph.add((self.id, DCTERMS.identifier, literal(identifier)))
 
     
     def has_type(self, type: "Type") -> None:
         self.graph.add((self.id, LRM.P2_has_type, type.id))
 
 
+def category_id(category: str) -> URIRef:
+    """The name of an export category's graph."""
+    return SPATREM[f"graph/{category}"]
+
+
+def new_graph() -> Graph:
+    """A fresh in-memory graph with the spatrem prefixes bound."""
+    graph = Graph()
+    for k, v in BaseGraph.spatrem_namespaces.items():
+        graph.bind(k, v)
+    return graph
+
+
+class SharedStore:
+    """A single triple store holding the triples of every entity.
+
+    Instead of one rdflib Graph per entity, entities built while the
+    store is active write into one named graph per export category
+    (journals, issues, translators, ...), all backed by the same
+    store: a Memory store unless another one is given.
+    """
+
+    def __init__(self, store: Optional[Store] = None) -> None:
+        self.store = store if store is not None else Memory()
+        self.graphs: dict[str, Graph] = {}
+
+    def graph(self, category: str) -> Graph:
+        if category not in self.graphs:
+            graph = Graph(store=self.store, identifier=category_id(category))
+            for k, v in BaseGraph.spatrem_namespaces.items():
+                graph.bind(k, v)
+            self.graphs[category] = graph
+        return self.graphs[category]
+
+    def close(self) -> None:
+        self.store.close()
+
+    @contextmanager
+    def activate(self) -> Iterator["SharedStore"]:
+        """Make entities constructed inside the block use this store."""
+        previous = BaseGraph.shared_store
+        BaseGraph.shared_store = self
+        try:
+            yield self
+        finally:
+            BaseGraph.shared_store = previous
+
+
+@contextmanager
+def deterministic_ids() -> Iterator[None]:
+    """Derive the IRIs of entities constructed inside the block from their keys."""
+    previous = BaseGraph.deterministic
+    BaseGraph.deterministic = True
+    try:
+        yield
+    finally:
+        BaseGraph.deterministic = previous
+
+
 class Type(BaseGraph):
+    category = "types"
+    # types are a fixed vocabulary, so their IRIs never change
+    deterministic = True
+
     def __init__(self, label:str) -> None:
         super().__init__(label)
         self.graph.add((self.id, RDF.type, CRM.E55_Type))
         self.has_identifier(label)
 
+    def _new_graph(self, owner: Optional[BaseGraph] = None) -> Graph:
+        # types are built once, on first use, and shared by every
+        # importer, so they never write into a shared store
+        return new_graph()
+
         
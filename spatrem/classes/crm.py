@@ -5,8 +5,11 @@ from rdflib.namespace._RDFS import RDFS
 from rdflib.namespace._XSD import XSD
 from spatrem.classes.base_graph import BaseGraph
 from spatrem.classes import LRM, CRM, SCHEMA, DCTERMS
+from spatrem.classes.terms import literal
 
 class Type(BaseGraph):
+    category = "types"
+
     def __init__(self, label: str, namespace: str = "type") -> None:
         super().__init__(label, namespace)
         self.graph.add((self.id, RDF.type, CRM.E55_Type))
@@ -14,10 +17,11 @@ class Type(BaseGraph):
 class Person(BaseGraph):
     ns = "person"
 
-    def __init__(self, key: str, persName: Optional[str] = None) -> None:
-        super().__init__(label=None, namespace="person")
+    def __init__(self, key: str, persName: Optional[str] = None,
+                 iri_key: Optional[str] = None) -> None:
+        super().__init__(label=None, namespace="person", iri_key=iri_key or key)
         self.graph.add((self.id, RDF.type, CRM.E21_Person))
-        self.graph.add((self.id, DCTERMS.identifier, Literal(key)))        
+        self.graph.add((self.id, DCTERMS.identifier, Literal(key)))
         if persName:
             self.label = persName.strip()
             self.graph.add((self.id, RDFS.label, Literal(persName.strip())))
@@ -32,21 +36,23 @@ class Person(BaseGraph):
 
 
     def has_birthdate(self, date: str) -> None:
-        self.graph.add((self.id, SCHEMA.birthDate, Literal(date)))
+        self.graph.add((self.id, SCHEMA.birthDate, literal(date)))
 
     def has_deathdate(self, date: str) -> None:
-        self.graph.add((self.id, SCHEMA.deathDate, Literal(date)))
+        self.graph.add((self.id, SCHEMA.deathDate, literal(date)))
 
     def has_gender(self, gender: str) -> None:
-        self.graph.add((self.id, SCHEMA.gender, Literal(gender)))
+        self.graph.add((self.id, SCHEMA.gender, literal(gender)))
 
     def has_nationality(self, nationality: str) -> None:
-        self.graph.add((self.id, SCHEMA.nationality, Literal(nationality)))
+        self.graph.add((self.id, SCHEMA.nationality, literal(nationality)))
 
 
 class Nomen(BaseGraph):
-    def __init__(self, name: str) -> None:
-        super().__init__(name.strip(), 'name')
+    category = "names"
+
+    def __init__(self, name: str, iri_key: Optional[str] = None) -> None:
+        super().__init__(name.strip(), 'name', iri_key=iri_key)
 
         self.graph.add((self.id, RDF.type, LRM.F12_Nomen))
         self.graph.add((self.id, LRM.R33_has_string, Literal(name)))
@@ -56,6 +62,8 @@ class Nomen(BaseGraph):
 
                         
 class Language(Type):
+    category = "languages"
+
     def __init__(self, label: str) -> None:
         super().__init__(label, namespace="language")
         self.graph.add((self.id, RDF.type, CRM.E56_Language))
@@ -82,7 +90,7 @@ class TimeSpan(BaseGraph):
         duration: XSD.duration = f"P{time_span_str}Y"
         self.graph.add((self.id, RDF.type, CRM.E52_Time_Span))
         self.graph.add((self.id, CRM.P82_at_some_time_within,
-                Literal(duration, datatype=XSD.duration)))
+                literal(duration, XSD.duration)))
 
 
         
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Generic, Iterator, Optional, TypeVar
 from rdflib.term import Literal
 from rdflib.namespace._RDF import RDF
 from rdflib.namespace._RDFS import RDFS
@@ -6,17 +6,49 @@ from spatrem.classes.base_graph import BaseGraph
 from spatrem.classes import LRM, CRM, SCHEMA, DCTERMS, SPATREM
 from spatrem.classes.crm import TimeSpan, Language, Person, Nomen
 
+T = TypeVar("T")
+
+
+class Parts(Generic[T]):
+    """The distinct parts of a work, in the order they were first added.
+
+    Rows link the same issue to its journal, and the same translation
+    to its issue, over and over; a Parts keeps each part once, so the
+    R67 links are only added for a new part and the collection grows
+    with the distinct parts rather than with the rows.
+    """
+
+    def __init__(self) -> None:
+        self._parts: dict[T, None] = {}
+
+    def add(self, part: T) -> bool:
+        """Add part, and return whether it was new."""
+        if part in self._parts:
+            return False
+        self._parts[part] = None
+        return True
+
+    def __contains__(self, part: object) -> bool:
+        return part in self._parts
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._parts)
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+
 class Work(BaseGraph):
-    def __init__(self, label: str) -> None:
-        super().__init__(label)
+    def __init__(self, label: str, iri_key: Optional[str] = None) -> None:
+        super().__init__(label, iri_key=iri_key)
         self.graph.add((self.id, RDF.type, LRM.F1_Work))
-        self.expression = Expression()
+        self.expression = Expression(owner=self)
         self.is_realised_by(self.expression)
 
     def is_realised_by(self, expr: "Expression") -> None:
         self.expression = expr
         self.graph.add((self.id, LRM.R3i_is_realised_by, expr.id))
-        self.graph += expr.graph
+        self.merge(expr)
 
 
     def was_realised_through(self, expression_creation: "ExpressionCreation") -> None:
@@ -49,7 +81,6 @@ class Work(BaseGraph):
 
     def has_language(self, language: Language) -> None:
         self.expression.has_language(language)
-        self.graph += self.expression.graph
         
 
 
@@ -65,8 +96,9 @@ class SerialWork(Work):
 
 
 class Expression(BaseGraph):
-    def __init__(self, label: Optional[str] = None) -> None:
-        super().__init__(label)
+    def __init__(self, label: Optional[str] = None,
+                 owner: Optional[BaseGraph] = None) -> None:
+        super().__init__(label, owner=owner)
         self.graph.add((self.id, RDF.type, LRM.F2_Expression))
 
     def realises(self, work: Work) -> None:
@@ -131,8 +163,9 @@ class ExpressionCreation(BaseGraph):
 
 
 class WorkCreation(BaseGraph):
-    def __init__(self, label: Optional[str] = None) -> None:
-        super().__init__(label)
+    def __init__(self, label: Optional[str] = None,
+                 owner: Optional[BaseGraph] = None) -> None:
+        super().__init__(label, owner=owner)
         self.graph.add( (self.id, RDF.type, LRM.F27_Work_Creation))
 
     def created(self, work:Work) -> None:
@@ -1,21 +1,45 @@
-from typing import Optional
+from typing import Iterator, Mapping, Optional
 from rdflib.term import Literal
+from rdflib import Graph
 from rdflib.namespace._RDF import RDF
+from rdflib.namespace._RDFS import RDFS
+from rdflib.term import URIRef
 from spatrem.classes import LRM, CRM, SCHEMA, DCTERMS, SPATREM
 from spatrem.classes.base_graph import BaseGraph, Type
+from spatrem.classes.terms import literal
 import spatrem.classes.lrm as lrm
 import spatrem.classes.crm as crm
 from spatrem.classes.lrm import SerialWork, Work, Expression, Manifestation, ManifestationCreation, TimeSpan, WorkCreation
-from spatrem.classes.crm import Person
+from spatrem.classes.crm import Nomen, Person
 
-types = { 'journal': Type('journal'),
-          'issue': Type('issue'),
-          'constituent': Type('constituent'),
-          'translation': Type('translation'),
-          'original': Type('original'),
-          'author': Type('author'),
-          'translator': Type('translator'),
-    }
+class Types(Mapping):
+    """The entity types, each built the first time it is used.
+
+    Importing this module builds nothing; a Type and its graph are
+    only created when an entity (or an Importer) first asks for it.
+    """
+
+    labels = ('journal', 'issue', 'constituent', 'translation',
+              'original', 'author', 'translator')
+
+    def __init__(self) -> None:
+        self._types: dict[str, Type] = {}
+
+    def __getitem__(self, label: str) -> Type:
+        if label not in self._types:
+            if label not in self.labels:
+                raise KeyError(label)
+            self._types[label] = Type(label)
+        return self._types[label]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.labels)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+types = Types()
 
 
 
@@ -33,14 +57,17 @@ class Kb():
 
 
 class Journal(lrm.SerialWork):
+    category = "journals"
+
     def __init__(self, label:str) -> None:
         super().__init__(label)
         self.graph.add((self.id, DCTERMS.identifier, Literal(label)))
-        self.issues = []
+        self.issues: lrm.Parts[Issue] = lrm.Parts()
         self.has_type(types['journal'])
         
     def publishes(self, issue: "Issue", year: str) -> None:
-        self.issues.append(issue)
+        if not self.issues.add(issue):
+            return
 
         # manifestation_creation = ManifestationCreation()
         # pubDate = lrm.TimeSpan(year)
@@ -66,23 +93,25 @@ class Journal(lrm.SerialWork):
 
 
 class Issue(lrm.Work):
+    category = "issues"
+
     def __init__(self, identifier: str,
                  volume: Optional[str] = None,
                  number: Optional[str] = None,
                  pubDate: Optional[str] = None,
                  language_area: Optional[str] = None) -> None:
         super().__init__(identifier)
-        self.constituents = []
+        self.constituents: lrm.Parts[Constituent] = lrm.Parts()
         self.has_type(types['issue'])
         self.graph.add((self.id, DCTERMS.identifier, Literal(identifier)))
         if volume:
-            self.graph.add((self.id, SPATREM.volume, Literal(volume)))
+            self.graph.add((self.id, SPATREM.volume, literal(volume)))
 
         if number:
-            self.graph.add((self.id, SPATREM.number, Literal(number)))
+            self.graph.add((self.id, SPATREM.number, literal(number)))
 
         if pubDate:
-            self.graph.add((self.id, SPATREM.pubDate, Literal(pubDate)))
+            self.graph.add((self.id, SPATREM.pubDate, literal(pubDate)))
 
         if language_area:
             self.has_language_area(language_area)
@@ -100,19 +129,21 @@ class Issue(lrm.Work):
 
 
     def includes(self, constituent) -> None:
-        self.constituents.append(constituent)
+        if not self.constituents.add(constituent):
+            return
         self.has_part(constituent)
         constituent.is_part_of(self)
 
     def has_language_area(self, language_area:str) -> None:
-        self.graph.add((self.id, SPATREM.language_area, Literal(language_area)))
+        self.graph.add((self.id, SPATREM.language_area, literal(language_area)))
 
         
 
 
 class Constituent(lrm.Work):
-    def __init__(self, title: Optional[str] = None) -> None:
-        super().__init__(title)
+    def __init__(self, title: Optional[str] = None,
+                 iri_key: Optional[str] = None) -> None:
+        super().__init__(title, iri_key=iri_key)
         self.has_type(types['constituent'])
         # self.expression_creation = lrm.ExpressionCreation()
         # self.expression = lrm.Expression()
@@ -120,28 +151,28 @@ class Constituent(lrm.Work):
         # self.expression_creation.created(self.expression)
         # self.expression.was_created_by(self.expression_creation)
 
-        self.work_creation = WorkCreation()
+        self.work_creation = WorkCreation(owner=self)
         self.was_created_by(self.work_creation)
 
         # self.graph += self.expression_creation.graph
         # self.graph += self.expression.graph
-        self.graph += self.work_creation.graph
 
 
     
 
     def written_by(self, person: Person) -> None:
         self.work_creation.carried_out_by(person)
-        self.graph += self.work_creation.graph
 
     def has_genre(self, genre:str) -> None:
         # self.has_type(genre)
-        self.graph.add((self.id, SPATREM.genre, Literal(genre)))
+        self.graph.add((self.id, SPATREM.genre, literal(genre)))
 
 
 class Translation(Constituent):
-    def __init__(self, title: str) -> None:
-        super().__init__(title)
+    category = "translations"
+
+    def __init__(self, title: str, iri_key: Optional[str] = None) -> None:
+        super().__init__(title, iri_key=iri_key)
         self.has_type(types['translation'])
 
     def has_original(self, original:"Original") -> None:
@@ -154,14 +185,17 @@ class Translation(Constituent):
 
 
 class Original(Constituent):
-    def __init__(self, title: Optional[str] = None) -> None:
-        super().__init__(title)
+    category = "originals"
+
+    def __init__(self, title: Optional[str] = None,
+                 iri_key: Optional[str] = None) -> None:
+        super().__init__(title, iri_key=iri_key)
         self.has_type(types['original'])
         
 
 class Writer(Person):
-    def __init__(self, key:str, persName:str) -> None:
-        super().__init__(key, persName)
+    def __init__(self, key:str, persName:str, iri_key: Optional[str] = None) -> None:
+        super().__init__(key, persName, iri_key)
         self.graph.add((self.id, RDF.type, CRM.E39_Actor))
 
     def wrote(self, work:Constituent) -> None:
@@ -170,30 +204,112 @@ class Writer(Person):
 
 
 class Author(Writer):
-    def __init__(self, key:str, persName:str) -> None:
-        super().__init__(key, persName)
+    category = "authors"
+
+    def __init__(self, key:str, persName:str, iri_key: Optional[str] = None) -> None:
+        super().__init__(key, persName, iri_key)
         self.has_type(types['author'])
 
 
 class Translator(Writer):
-    def __init__(self, key: str, persName:str) -> None:
-        super().__init__(key, persName)
+    category = "translators"
+
+    def __init__(self, key: str, persName:str, iri_key: Optional[str] = None) -> None:
+        super().__init__(key, persName, iri_key)
         self.has_type(types['translator'])
 
     def has_birth_year(self, year:str) -> None:
-        self.graph.add((self.id, SPATREM.year_birth, Literal(year)))
+        self.graph.add((self.id, SPATREM.year_birth, literal(year)))
 
     def has_death_year(self, year:str) -> None:
-        self.graph.add((self.id, SPATREM.year_death, Literal(year)))
+        self.graph.add((self.id, SPATREM.year_death, literal(year)))
 
     def has_nationality(self, nationality:str) -> None:
-        self.graph.add((self.id, SPATREM.nationality, Literal(nationality)))
+        self.graph.add((self.id, SPATREM.nationality, literal(nationality)))
 
     def has_gender(self, gender:str) -> None:
-        self.graph.add((self.id, SPATREM.gender, Literal(gender)))
+        self.graph.add((self.id, SPATREM.gender, literal(gender)))
 
     def has_language_area(self, language_area:str) -> None:
-        self.graph.add((self.id, SPATREM.language_area, Literal(language_area)))
+        self.graph.add((self.id, SPATREM.language_area, literal(language_area)))
+
+
+
+class AnonymousPerson:
+    """One anonymous contribution's person, as handed to the row logic.
+
+    It has the id and the wrote method of a Writer, but no graph: what
+    it does is recorded in its AnonymousPersons.
+    """
+    __slots__ = ("persons", "id")
+
+    def __init__(self, persons: "AnonymousPersons", id: URIRef) -> None:
+        self.persons = persons
+        self.id = id
+
+    def wrote(self, work: Constituent) -> None:
+        self.persons.performed.append((self.id, work.work_creation.id))
+
+
+class AnonymousPersons:
+    """The anonymous translators or authors of an import, kept compactly.
+
+    Every anonymous contribution has a person of its own, but those
+    persons only differ in their IRI, the name they were listed under
+    and the work creation they performed.  Instead of a Translator or
+    Author (and, without a shared store, a graph) per contribution,
+    only those are kept, and write_triples adds the triples the
+    Translator or Author would have had, from a template shared by
+    all of them, to graph.  The nomen they are identified by gets its
+    P1_identifies triples at the same time.
+    """
+
+    def __init__(self, writer: type[Writer], graph: Graph) -> None:
+        self.writer = writer
+        self.category = writer.category
+        self.graph = graph
+        self.ids: list[URIRef] = []
+        self.names: list[str] = []
+        self.performed: list[tuple[URIRef, URIRef]] = []
+        self.nomen: Optional[Nomen] = None
+        self._written = 0
+        self._performed_written = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, key: str, name: str, nomen: Nomen) -> AnonymousPerson:
+        """A new anonymous person, listed as name, with IRI key key."""
+        self.nomen = nomen
+        id = self.writer._mint_id("person", key)
+        self.ids.append(id)
+        self.names.append(name)
+        return AnonymousPerson(self, id)
+
+    def template(self) -> list[tuple]:
+        """The predicates and objects every anonymous person has."""
+        return [
+            (RDF.type, CRM.E21_Person),
+            (DCTERMS.identifier, literal("Anon")),
+            (RDF.type, CRM.E39_Actor),
+            (LRM.P2_has_type, types[self.writer.__name__.lower()].id),
+            (CRM.P1_is_identified_by, self.nomen.id),
+        ]
+
+    def write_triples(self) -> None:
+        """Add the triples of the persons added since the last call to graph."""
+        if self._written < len(self.ids):
+            template = self.template()
+            new = range(self._written, len(self.ids))
+            self.graph.addN((self.ids[i], p, o, self.graph) for i in new for p, o in template)
+            self.graph.addN((self.ids[i], RDFS.label, Literal(self.names[i].strip()), self.graph)
+                            for i in new if self.names[i])
+            self.nomen.graph.addN((self.nomen.id, CRM.P1_identifies, self.ids[i], self.nomen.graph)
+                                  for i in new)
+            self._written = len(self.ids)
+        self.graph.addN((id, CRM.P14i_performed, creation, self.graph)
+                        for id, creation in self.performed[self._performed_written:])
+        self._performed_written = len(self.performed)
 
 
 # class Genre(Type):
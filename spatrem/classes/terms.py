@@ -0,0 +1,39 @@
+"""Shared rdflib terms.
+
+The namespaces of this package create each attribute term
+(SPATREM.genre) once, and literal() returns a shared Literal for
+values that repeat: years, genders, nationalities, language areas,
+genres and the identifiers of vocabulary terms.  Titles, names and the
+identifiers of persons, journals and issues are distinct per entity
+and use Literal directly, so they do not push the repeated values out
+of literal's cache.
+"""
+from functools import lru_cache
+from typing import Optional
+from rdflib import Literal, URIRef
+from rdflib import Namespace as RDFLibNamespace
+
+LITERAL_CACHE_SIZE = 8192
+
+
+class Namespace(RDFLibNamespace):
+    """A Namespace whose attribute terms (SPATREM.genre) are shared.
+
+    Item lookups (SPATREM[id]) mint entity IRIs and are not cached.
+    """
+
+    def __getattr__(self, name: str) -> URIRef:
+        if name.startswith("__"):
+            raise AttributeError
+        return _term(self, name)
+
+
+@lru_cache(maxsize=None)
+def _term(namespace: Namespace, name: str) -> URIRef:
+    return RDFLibNamespace.term(namespace, name)
+
+
+@lru_cache(maxsize=LITERAL_CACHE_SIZE)
+def literal(value: str, datatype: Optional[URIRef] = None) -> Literal:
+    """A shared Literal for a value that occurs over and over."""
+    return Literal(value, datatype=datatype)
@@ -0,0 +1,123 @@
+"""Columnar reading of translation csv files.
+
+read_translation_rows reads a whole translation file into columns and
+parses each distinct value of a column once rather than once per row:
+journals, years, issues and language areas repeat on almost every
+row, and so do the translator, author and language fields.
+Each column is dictionary encoded, a mapping from its distinct values
+to their parsed form, and the rows are put back together from those.
+
+Parsed values are shared between the rows they occur in (two rows
+naming the same translators get the same dict), and the row logic
+only reads them.
+
+A regular row (one value per header column, with the required columns
+present in the header) needs no validation: every value is a string.
+Any other row is validated with TranslationRecord as the row path
+would, so it raises exactly the error it always did.
+"""
+import csv
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence, TypeVar
+from spatrem.importer import (TranslationRecord, TranslationRow, clean_id, issue_parts,
+                              optional_field, split_languages, split_names)
+from spatrem.pipeline import read_ahead
+from spatrem.stats import Stats
+
+T = TypeVar("T")
+
+REQUIRED = ("Journal", "Year", "Issue_ID")
+
+
+def read_columns(infile: Path,
+                 pipelined: bool = False) -> tuple[dict[str, Sequence[Optional[str]]], int]:
+    """The columns of a ;-delimited csv file, by header name, and its number of rows."""
+    source = read_ahead(infile) if pipelined else open(infile, mode="r", encoding="utf-8-sig")
+    with source as data:
+        reader = csv.reader(data, delimiter=";")
+        header = next(reader, None)
+        if header is None:
+            return {}, 0
+        width = len(header)
+        regular = all(name in header for name in REQUIRED)
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            if not regular or len(row) != width:
+                row = validated(header, row)
+            rows.append(row)
+    return dict(zip(header, zip(*rows))), len(rows)
+
+
+def validated(header: list[str], row: list[str]) -> list[Optional[str]]:
+    """Validate an irregular row the way DictReader and TranslationRecord would."""
+    values: dict = dict(zip(header, row))
+    if len(row) > len(header):
+        values[None] = row[len(header):]
+    for name in header[len(row):]:
+        values[name] = None
+    TranslationRecord(**values)
+    return [values[name] for name in header]
+
+
+def decoded(values: Sequence[T], parse: Callable[[T], object]) -> list:
+    """Parse each distinct value of a column once."""
+    parsed = {value: parse(value) for value in set(values)}
+    return [parsed[value] for value in values]
+
+
+def listed(name: Optional[str]) -> Optional[tuple[str, str]]:
+    return (clean_id(name), name) if name else None
+
+
+def read_translation_rows(infile: Path, stats: Optional[Stats] = None,
+                          pipelined: bool = False) -> Iterator[TranslationRow]:
+    """The parsed rows of a translations csv file, in file order."""
+    with stats.phase("csv parsing") if stats else nullcontext():
+        columns, n = read_columns(infile, pipelined)
+    if stats:
+        stats.rows[infile.name] += n
+    if not n:
+        return
+
+    def column(name: str) -> Sequence[Optional[str]]:
+        return columns.get(name, (None,) * n)
+
+    with stats.phase("validation") if stats else nullcontext():
+        journals = decoded(column("Journal"), str.strip)
+        years = decoded(column("Year"), str.strip)
+        dates = decoded(column("Year"), optional_field)
+        issues = decoded(list(zip(journals, column("Vol"), column("No"))),
+                         lambda key: issue_parts(*key))
+        areas = decoded(column("Language_area"), optional_field)
+        translators = decoded(column("Translator"), split_names)
+        listed_translators = decoded(column("Listed_Translator"), listed)
+        authors = decoded(column("Author"), split_names)
+        sl = decoded(column("SL"), split_languages)
+        tl = decoded(column("TL"), split_languages)
+        titles = column("Title")
+        title_ids = decoded(titles, lambda title: clean_id(title or ""))
+        genres = decoded(column("Genre"), lambda genre: genre.strip() if genre else None)
+
+    for i in range(n):
+        issue_id, volume, number = issues[i]
+        yield TranslationRow(
+            journal=journals[i],
+            year=years[i],
+            pubDate=dates[i],
+            issue_id=issue_id,
+            volume=volume,
+            number=number,
+            language_area=areas[i],
+            translators=translators[i],
+            listed_translator=listed_translators[i],
+            authors=authors[i],
+            sl=sl[i],
+            tl=tl[i],
+            title=titles[i] or None,
+            title_id=title_ids[i],
+            genre=genres[i],
+        )
+
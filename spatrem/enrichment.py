@@ -0,0 +1,134 @@
+"""Joining translator records to the translators of an import.
+
+A TranslatorJoin matches each record of a translators file to a
+translator by normalized name, then by pseudonym, using a hash index
+from name keys to translator keys that grows with every record it
+joins:
+
+    the record's name matches one translator        matched (via name)
+    else its pseudonyms match one translator        matched (via pseudonym)
+    they match several translators                  ambiguous
+    nothing matches                                 missed
+
+Translators that a matched record's pseudonyms also name are reported
+as its aliases, not merged.  The outcomes are collected in a
+JoinReport.
+"""
+import unicodedata
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import Callable, Iterable
+from spatrem.importer import TranslatorRecord, clean_id, split_names
+
+
+def name_key(name: str) -> str:
+    """A name with case, accents, spacing and punctuation normalized away."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    return clean_id("".join(c for c in decomposed if not unicodedata.combining(c))).casefold()
+
+
+@dataclass
+class Match:
+    name: str
+    translator: str
+    via: str
+
+
+@dataclass
+class JoinReport:
+    matched: list[Match] = field(default_factory=list)
+    missed: list[str] = field(default_factory=list)
+    ambiguous: dict[str, list[str]] = field(default_factory=dict)
+    aliases: dict[str, list[str]] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def summary(self) -> str:
+        lines = [f"{len(self.matched)} matched "
+                 f"({sum(m.via == 'pseudonym' for m in self.matched)} via a pseudonym), "
+                 f"{len(self.missed)} missed, {len(self.ambiguous)} ambiguous"]
+        lines += [f"missed: {name}" for name in self.missed]
+        lines += [f"ambiguous: {name} could be {', '.join(keys)}"
+                  for name, keys in self.ambiguous.items()]
+        lines += [f"aliases: {name} is also credited as {', '.join(keys)}"
+                  for name, keys in self.aliases.items()]
+        return "\n".join(lines)
+
+
+class TranslatorJoin:
+    def __init__(self, translators: dict) -> None:
+        """A join against translators, the importer's translators by key.
+
+        Translators added to the dict later are indexed on the next
+        join.
+        """
+        self.translators = translators
+        self.index: dict[str, set[str]] = {}
+        self.report = JoinReport()
+        self._indexed = 0
+
+    def _add(self, name: str, key: str) -> None:
+        self.index.setdefault(name_key(name), set()).add(key)
+
+    def _index_new_translators(self) -> None:
+        for key in islice(self.translators, self._indexed, None):
+            if key == "Anon":
+                continue
+            self._add(key, key)
+            label = getattr(self.translators[key], "label", None)
+            if label:
+                self._add(label, key)
+        self._indexed = len(self.translators)
+
+    def _lookup(self, names: Iterable[str]) -> set[str]:
+        keys: set[str] = set()
+        for name in names:
+            keys |= self.index.get(name_key(name), set())
+        return keys
+
+    def join(self, records: Iterable[TranslatorRecord],
+             enrich: Callable[[str, TranslatorRecord, dict[str, str]], None]) -> JoinReport:
+        """Join records to the translators and enrich each matched translator.
+
+        enrich is called with the translator key, the record and the
+        names (clean_id to name) to link to the translator as well:
+        the pseudonyms, and the record's own name when it was matched
+        by a pseudonym.  Returns the report of this join; self.report
+        collects the reports of every join.
+        """
+        self._index_new_translators()
+        report = JoinReport()
+        for r in records:
+            name = r.Surname_Name.strip()
+            pseudonyms = split_names(r.Pseudonyms) if r.Pseudonyms != "NONE" else {}
+            via = "name"
+            keys = self._lookup([name])
+            if not keys:
+                via = "pseudonym"
+                keys = self._lookup(pseudonyms.values())
+            if not keys:
+                report.missed.append(name)
+                continue
+            if len(keys) > 1:
+                report.ambiguous[name] = sorted(keys)
+                continue
+            [key] = keys
+            names = dict(pseudonyms)
+            if via == "pseudonym":
+                names[clean_id(name)] = name
+            others = self._lookup(pseudonyms.values()) - {key}
+            if via == "name" and others:
+                report.aliases[name] = sorted(others)
+            enrich(key, r, names)
+            report.matched.append(Match(name, key, via))
+            # names already in the index stay with the translators they name
+            for alias in [name, *pseudonyms.values()]:
+                if name_key(alias) not in self.index:
+                    self._add(alias, key)
+
+        self.report.matched += report.matched
+        self.report.missed += report.missed
+        self.report.ambiguous.update(report.ambiguous)
+        self.report.aliases.update(report.aliases)
+        return report
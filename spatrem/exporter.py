@@ -0,0 +1,94 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+from rdflib import Graph
+from rdflib.term import Literal, Node, URIRef
+from spatrem.classes.base_graph import new_graph
+from spatrem.pipeline import Writer
+from spatrem.turtle import STRING_ESCAPES, write_turtle
+
+FORMATS = ("ttl", "nt", "nq")
+
+
+def check_format(format: str) -> None:
+    if format not in FORMATS:
+        raise ValueError(f"unknown export format {format!r}, expected one of {', '.join(FORMATS)}")
+
+
+def nt_term(term: Node) -> str:
+    if isinstance(term, Literal):
+        text = f'"{term.translate(STRING_ESCAPES)}"'
+        if term.language:
+            return f"{text}@{term.language}"
+        if term.datatype:
+            return f"{text}^^<{term.datatype}>"
+        return text
+    return term.n3()
+
+
+def nt_line(triple) -> str:
+    s, p, o = triple
+    return f"{s.n3()} {p.n3()} {nt_term(o)} .\n"
+
+
+def nq_line(triple, context: URIRef) -> str:
+    s, p, o = triple
+    return f"{s.n3()} {p.n3()} {nt_term(o)} {context.n3()} .\n"
+
+
+def stream_graphs(path: Path, graphs: Iterable[Graph],
+                  context: Optional[URIRef] = None,
+                  writer: Optional[Writer] = None) -> int:
+    """Write the triples of graphs to path as N-Triples, one graph at a time.
+
+    If context is given, lines are written as N-Quads in that named
+    graph.  A graph shared by several entities is written only once.
+    With writer, the file is written by the writer's thread.  Returns
+    the number of lines written.
+    """
+    seen: set[int] = set()
+    count = 0
+    out = writer.open(path) if writer else open(path, mode="w", encoding="utf-8")
+    with out:
+        for graph in graphs:
+            if id(graph) in seen:
+                continue
+            seen.add(id(graph))
+            for triple in graph:
+                if context is None:
+                    out.write(nt_line(triple))
+                else:
+                    out.write(nq_line(triple, context))
+                count += 1
+    return count
+
+
+def serialize_turtle(triples: list, destination: str, fast: bool = False) -> None:
+    """Serialize triples as Turtle to destination (a process pool task).
+
+    With fast, the spatrem Turtle writer is used instead of rdflib's
+    serializer (see spatrem.turtle).
+    """
+    if fast:
+        with open(destination, mode="w", encoding="utf-8") as out:
+            write_turtle(out, triples)
+        return
+    graph = new_graph()
+    graph.addN((s, p, o, graph) for s, p, o in triples)
+    graph.serialize(destination=destination)
+
+
+def serialize_in_parallel(graphs: dict[Path, Graph], jobs: int, fast: bool = False) -> None:
+    """Serialize each graph to its path as Turtle in a pool of jobs processes.
+
+    Graphs are sent to the workers as lists of triples, largest first,
+    so the pool is not left waiting on a big category started last.
+    Turtle output does not depend on triple order, so the files are
+    byte-identical to serializing the graphs one after another.
+    """
+    ordered = sorted(graphs.items(), key=lambda item: len(item[1]), reverse=True)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(serialize_turtle, list(graph), str(path), fast)
+                   for path, graph in ordered]
+        for future in futures:
+            future.result()
@@ -1,6 +1,7 @@
 from pathlib import Path
 from csv import DictReader
 from pydantic import BaseModel
+import typer
 
 
 from rdflib import Graph
@@ -33,10 +34,6 @@ class TranslatorRecord(BaseModel):
     Journals: Optional[str] = None
     Notes: Optional[str] = None
 
-datafile = Path("/Users/wulfmanc/projects/sm/spatrem/SpaTrEM_Database/Datasets/translations/DE_Translations.csv")
-tfile = Path("/Users/wulfmanc/Desktop/DE/translators.ttl")
-nfile = Path("/Users/wulfmanc/Desktop/DE/names.ttl")
-
 class Importer:
     def __init__(self, datafile: Path, tfile: Path, nfile: Path) -> None:
         self. graph = Graph()
@@ -51,6 +48,12 @@ class Importer:
         self.graph.parse(nfile)
         
 
-i = Importer(datafile, tfile, nfile)
-names = list(i.graph.subjects((RDF.type, CRM.E21_Person)))
-print(len(names))
+def main(datafile: str, tfile: str, nfile: str) -> None:
+    """Count the persons in an exported translators.ttl and names.ttl."""
+    i = Importer(Path(datafile), Path(tfile), Path(nfile))
+    names = list(i.graph.subjects(RDF.type, CRM.E21_Person))
+    print(len(names))
+
+
+if __name__ == "__main__":
+    typer.run(main)
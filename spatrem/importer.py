@@ -1,11 +1,31 @@
+import logging
 import re
-from typing import Optional
+from contextlib import ExitStack, nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, ContextManager, Iterable, Iterator, Optional
 from pathlib import Path
 from csv import DictReader
 from pydantic import BaseModel
+from rdflib import Graph
+from spatrem.aggregates import Aggregates
 from spatrem.classes.crm import Language, Nomen
-from spatrem.classes.base_graph import BaseGraph
-from spatrem.classes.magazine import Journal, Issue, Translator, Author, Translation, Original, types
+from spatrem.classes.base_graph import BaseGraph, SharedStore, category_id, deterministic_ids, new_graph
+from spatrem.classes.magazine import (AnonymousPersons, Journal, Issue, Translator, Author,
+                                     Translation, Original, types)
+from spatrem.exporter import check_format, serialize_in_parallel, stream_graphs
+from spatrem.index import TranslationIndex
+from spatrem.pipeline import Writer, read_ahead
+from spatrem.rows import RowDecoder
+from spatrem.shards import ShardSize, write_shards
+from spatrem.snapshot import SNAPSHOT, write_snapshot
+from spatrem.sqlite_store import SQLiteStore
+from spatrem.stats import Stats
+from spatrem.turtle import write_turtle
+
+if TYPE_CHECKING:
+    from spatrem.enrichment import TranslatorJoin
+
+logger = logging.getLogger(__name__)
 
 
 class TranslationRecord(BaseModel):
@@ -40,328 +60,669 @@ class TranslatorRecord(BaseModel):
 
 def clean_id(dirty_string: str) -> str:
     return re.sub(r"\W", "", dirty_string)
-    
+
+
+# fast-path decoders for the records (see spatrem.rows)
+decoders: dict[type[BaseModel], RowDecoder] = {
+    TranslationRecord: RowDecoder(TranslationRecord),
+    TranslatorRecord: RowDecoder(TranslatorRecord),
+}
+
+
+def read_records(infile: Path, model: type[BaseModel], fast: bool = False,
+                 stats: Optional[Stats] = None, pipelined: bool = False) -> Iterator:
+    """Validate the rows of a ;-delimited csv file one at a time.
+
+    With fast, rows are validated in batches by the model's RowDecoder
+    instead of one at a time.  With stats, the time spent parsing the
+    csv and validating rows is recorded.  With pipelined, the file is
+    read ahead in a background thread (see spatrem.pipeline).
+    """
+    source = read_ahead(infile) if pipelined else open(infile, mode="r", encoding="utf-8-sig")
+    with source as data:
+        rows: Iterable[dict] = DictReader(data, delimiter=";")
+        if stats:
+            rows = stats.timed(rows, "csv parsing")
+        if fast:
+            records = decoders[model].decode_all(rows)
+        else:
+            records = (model(**row) for row in rows)
+        if stats:
+            records = stats.timed(records, "validation")
+        yield from records
+
+
+def split_names(field: Optional[str]) -> dict[str, str]:
+    """Map the clean_id of each name in a ;-separated field to the name."""
+    if not field:
+        return {}
+    stripped = [n.strip() for n in field.split(";")]
+    return {clean_id(name): name for name in stripped if name != "NONE"}
+
+
+def split_languages(field: Optional[str]) -> list[str]:
+    """The languages in a ;-separated SL or TL field."""
+    if not field:
+        return []
+    languages = [x.strip() for x in field.split(";")]
+    return list(filter(lambda x: x!= "NONE", languages))
+
+
+def issue_key(journal: str, r: TranslationRecord) -> tuple[str, Optional[str], Optional[str]]:
+    """The issue id, volume and number of a translation record."""
+    return issue_parts(journal, r.Vol, r.No)
+
+
+def issue_parts(journal: str, vol: Optional[str],
+                no: Optional[str]) -> tuple[str, Optional[str], Optional[str]]:
+    """The issue id, volume and number for a journal's Vol and No fields."""
+    issue_id = journal
+
+    volume = None
+    if vol and vol.strip() != "NONE":
+        volume = vol.strip()
+        issue_id = f"{issue_id}_{volume}"
+
+    number = None
+    if no and no.strip() != "NONE":
+        number = no.strip()
+        # clean up badly formed number data like "23; 24".
+        # convert it into "23_24" to match other data.
+        if ';' in number:
+            number = "_".join([x.strip() for x in number.split(";")])
+        issue_id = f"{issue_id}_{number}"
+
+    return issue_id, volume, number
+
+
+def optional_field(field: Optional[str]) -> Optional[str]:
+    """A stripped field value, or None if it is empty or NONE."""
+    if field and field.strip() != "NONE":
+        return field.strip()
+    return None
+
+
+@dataclass
+class TranslationRow:
+    """The values of a translation record the row logic works with.
+
+    Names are mapped from their clean_id to the name, and the
+    languages and issue are parsed the way the row logic needs them.
+    """
+    journal: str
+    year: str
+    pubDate: Optional[str]
+    issue_id: str
+    volume: Optional[str]
+    number: Optional[str]
+    language_area: Optional[str]
+    translators: dict[str, str]
+    listed_translator: Optional[tuple[str, str]]
+    authors: dict[str, str]
+    sl: list[str]
+    tl: list[str]
+    title: Optional[str]
+    title_id: str
+    genre: Optional[str]
+
+
+def translation_row(r: TranslationRecord) -> TranslationRow:
+    journal = r.Journal.strip()
+    issue_id, volume, number = issue_key(journal, r)
+    listed = (clean_id(r.Listed_Translator), r.Listed_Translator) if r.Listed_Translator else None
+    return TranslationRow(
+        journal=journal,
+        year=r.Year.strip(),
+        pubDate=optional_field(r.Year),
+        issue_id=issue_id,
+        volume=volume,
+        number=number,
+        language_area=optional_field(r.Language_area),
+        translators=split_names(r.Translator),
+        listed_translator=listed,
+        authors=split_names(r.Author),
+        sl=split_languages(r.SL),
+        tl=split_languages(r.TL),
+        title=r.Title or None,
+        title_id=clean_id(r.Title or ""),
+        genre=r.Genre.strip() if r.Genre else None,
+    )
+
+
 class Importer:
-    def __init__(self) -> None:
+    def __init__(self, shared_store: bool = False,
+                 deterministic_ids: bool = False,
+                 streaming: bool = False,
+                 keep_records: Optional[bool] = None,
+                 fast_rows: bool = False,
+                 stats: bool = False,
+                 sqlite: Optional[Path] = None,
+                 index: bool = False,
+                 aggregates: bool = False,
+                 columnar: bool = False,
+                 pipelined: bool = False,
+                 compact_anonymous: bool = False,
+                 join_translators: bool = False) -> None:
+        """Create an importer.
+
+        With shared_store, every entity writes its triples into one
+        SharedStore owned by the importer rather than into an rdflib
+        Graph of its own.  With deterministic_ids, IRIs are derived
+        from stable keys (journal label, issue id, clean_id of names
+        and titles) so the same input always yields the same output.
+        With sqlite, the shared store keeps its triples in a SQLite
+        database at that path instead of in memory (see
+        spatrem.sqlite_store); it implies shared_store.
+
+        With streaming, each csv row is validated and turned into
+        entities as soon as it is read, and the records are only kept
+        in translation_records/translator_records if keep_records is
+        set.  Otherwise the whole file is validated first and the
+        records are always kept.
+
+        With fast_rows, rows are validated in batches by a RowDecoder
+        rather than one pydantic call per row (see spatrem.rows).
+
+        With stats, the time spent in each phase of the run, the rows
+        read, the entities built and the triples written are recorded
+        in self.stats (see spatrem.stats).
+
+        With index, the translations are indexed by languages, year,
+        journal, issue, translator and author as they are imported,
+        and self.index.find answers queries over them (see
+        spatrem.index).
+
+        With aggregates, counts of translations per journal and year,
+        per language pair and per translator gender and nationality
+        are collected during the import and written by export next to
+        the RDF files (see spatrem.aggregates).
+
+        With columnar, translation files are read into columns and
+        each distinct value of a column is parsed once (see
+        spatrem.columns).  No TranslationRecords are made, so
+        translation_records stays empty whatever keep_records says.
+
+        With pipelined, input files are read and output files written
+        in background threads (see spatrem.pipeline).
+
+        With compact_anonymous, the anonymous translators and authors
+        of each contribution are kept as AnonymousPersons rather than
+        one Translator or Author each, and their triples are only
+        added when the categories are exported.
+
+        With join_translators, translators files are joined to the
+        imported translators by normalized name and pseudonym rather
+        than by exact clean_id, and the matches, misses and ambiguous
+        records are collected in self.translator_join.report (see
+        spatrem.enrichment).
+        """
+        self.store: Optional[SharedStore] = None
+        if sqlite:
+            self.store = SharedStore(SQLiteStore(sqlite))
+        elif shared_store:
+            self.store = SharedStore()
+        self.deterministic_ids = deterministic_ids
+        self.streaming = streaming
+        self.keep_records = not streaming if keep_records is None else keep_records
+        self.fast_rows = fast_rows
+        self.columnar = columnar
+        self.pipelined = pipelined
+        self.stats: Optional[Stats] = Stats() if stats else None
+        self.index: Optional[TranslationIndex] = TranslationIndex() if index else None
+        self.aggregates: Optional[Aggregates] = Aggregates() if aggregates else None
         self.graph = BaseGraph()
         self.translation_records: list[TranslationRecord] = []
         self.translator_records: list[TranslatorRecord] = []
         self.journals: dict = {}
         self.issues: dict = {}
+        self.compact_anonymous = compact_anonymous
         self.translators: dict = {}
-        self.translators[clean_id('Anon')] = []
         self.authors: dict = {}
-        self.authors[clean_id('Anon')] = []
+        if compact_anonymous:
+            self.translators[clean_id('Anon')] = AnonymousPersons(Translator, self._graph("translators"))
+            self.authors[clean_id('Anon')] = AnonymousPersons(Author, self._graph("authors"))
+        else:
+            self.translators[clean_id('Anon')] = []
+            self.authors[clean_id('Anon')] = []
+        self.translator_join: Optional["TranslatorJoin"] = None
+        if join_translators:
+            from spatrem.enrichment import TranslatorJoin
+            self.translator_join = TranslatorJoin(self.translators)
         self.languages: dict = {}
         self.nomena: dict = {}
         # self.genres: dict = {}
         self.translations: dict = {}
         self.originals: list = []
 
+        if self.store:
+            self.graph.graph = self.store.graph("types")
+
         for _,v in types.items():
             self.graph.graph += v.graph
 
+    def building(self) -> ContextManager:
+        """Context in which new entities are built.
+
+        import_translation_record and import_translator_record must be
+        called inside it.
+        """
+        context = ExitStack()
+        if self.store:
+            context.enter_context(self.store.activate())
+        if self.deterministic_ids:
+            context.enter_context(deterministic_ids())
+        return context
+
+    def close(self) -> None:
+        """Commit and close the shared store, if there is one."""
+        if self.store:
+            self.store.close()
+
+    def _phase(self, name: str) -> ContextManager:
+        return self.stats.phase(name) if self.stats else nullcontext()
+
+    def _records(self, infile: Path, model: type[BaseModel], kept: list) -> Iterator:
+        """The validated records of a csv file, in file order."""
+        records = read_records(infile, model, self.fast_rows, self.stats, self.pipelined)
+        if not self.streaming:
+            records = list(records)
+        for record in records:
+            if self.stats:
+                self.stats.rows[infile.name] += 1
+            if self.keep_records:
+                kept.append(record)
+            yield record
+
     def import_translations_file(self, infile: Path) -> None:
-        with open(infile, mode="r", encoding="utf-8-sig") as data:
-            reader: DictReader = DictReader(data, delimiter=";")
-            for row in reader:
-                self.translation_records.append(TranslationRecord(**row))
-
-        for r in self.translation_records:
-            j = r.Journal.strip()
-            if j not in self.journals:
-                journal = Journal(j)
-                journal.has_identifier(j)
-                self.journals[j] = journal
-
-            journal: Journal = self.journals[j]
-                
-            issue_id = journal.label
-
-            volume = None
-            if r.Vol and r.Vol.strip() != "NONE":
-                volume = r.Vol.strip()
-                issue_id = f"{issue_id}_{volume}"
-
-            number = None
-            if r.No and r.No.strip() != "NONE":
-                number = r.No.strip()
-                # clean up badly formed number data like "23; 24".
-                # convert it into "23_24" to match other data.
-                if ';' in number:
-                    number = "_".join([x.strip() for x in number.split(";")])
-                issue_id = f"{issue_id}_{number}"
-
-            pubDate = None
-            if r.Year and r.Year.strip() != "NONE":
-                pubDate = r.Year.strip()
-
-            language_area = None
-            if r.Language_area and r.Language_area.strip() != "NONE":
-                language_area = r.Language_area.strip()
-
-            if issue_id and issue_id not in self.issues:
-                issue: Issue = Issue(identifier=issue_id,
-                                     volume=volume,
-                                     number=number,
-                                     pubDate=pubDate,
-                                     language_area=language_area)
-                self.issues[issue_id] = issue
-
-            issue: Issue = self.issues[issue_id]
-                
-            journal.publishes(issue, r.Year.strip())
-
-            translators = []
-            if r.Translator:
-                stripped = [n.strip() for n in r.Translator.split(";")]
-                ids = {clean_id(name): name for name in stripped if name != "NONE"}
-
-                for id,name in ids.items():
-                    if id not in self.nomena:
-                        self.nomena[id] = Nomen(name)
-
-                    if id in self.translators:
-                        if id == "Anon":
-                            translator = Translator(key=id, persName=name)
-                            translator.is_identified_by(self.nomena[id])
-                            self.nomena[id].identifies(translator)
-                            self.translators[id].append(translator)
-                        else:
-                            translator = self.translators[id]
-                    else:
-                        translator = Translator(key=id, persName=name)
-                        translator.is_identified_by(self.nomena[id])
-                        self.nomena[id].identifies(translator)
-                        if id == "Anon":
-                            self.translators["Anon"].append(translator)
-                        else:
-                            self.translators[id] = translator
-                    translators.append(translator)
-                        
-
-            
-            if r.Listed_Translator:
-                id = clean_id(r.Listed_Translator)
-                if id != "NONE" and id not in self.nomena:
-                    self.nomena[id] = Nomen(r.Listed_Translator)
-            
-            authors = []                
-            if r.Author:
-                stripped = [n.strip() for n in r.Author.split(";")]
-                ids = {clean_id(name): name for name in stripped if name != "NONE"}
-
-                for id,name in ids.items():
-                    if id not in self.nomena:
-                        self.nomena[id] = Nomen(name)
-
-                    if id in self.authors:
-                        if id == "Anon":
-                            author = Author(key=id, persName=name)
-                            author.is_identified_by(self.nomena[id])
-                            self.nomena[id].identifies(author)
-                            self.authors[id].append(author)
-                        else:
-                            author = self.authors[id]
-                    else:
-                        author = Author(key=id, persName=name)
-                        author.is_identified_by(self.nomena[id])
-                        self.nomena[id].identifies(author)
-                        if id == "Anon":
-                            self.authors["Anon"].append(author)
-                        else:
-                            self.authors[id] = author
-                    authors.append(author)
-
-                
-            sl = []
-            if r.SL:
-                languages = r.SL.split(";")
-                languages = [x.strip() for x in languages]
-                languages = list(filter(lambda x: x!= "NONE", languages))
-                for lang in languages:
-                    if lang not in self.languages:
-                        language = Language(lang)
-                        language.has_identifier(lang)
-                        self.languages[lang] = language
-                sl = [self.languages[lang] for lang in languages]
-
-                
-            tl = []
-            if r.TL:
-                languages = r.TL.split(";")
-                languages = [x.strip() for x in languages]
-                languages = list(filter(lambda x: x!= "NONE", languages))
-                
-                for lang in languages:
-                    if lang not in self.languages:
-                        language = Language(lang)
-                        language.has_identifier(lang)
-                        self.languages[lang] = language
-                tl = [self.languages[lang] for lang in languages]
-
-                
-            if r.Title:
-                id = clean_id(r.Title)
-                if id not in self.nomena:
-                    self.nomena[id] = Nomen(r.Title)
-
-                if id not in self.translations:
-                    work = Translation(r.Title)
-                    work.is_identified_by(self.nomena[id])
-
-                    
-                    for lang in tl:
-                        work.has_language(lang)
-
-                    original = Original()
-                    self.originals.append(original)
-
-                    work.has_original(original)
-
-                    for lang in sl:
-                        original.has_language(lang)
-
-                    if authors:
-                        for author in authors:
-                            original.written_by(author)
-                            author.wrote(original)
-
-                    if translators:
-                        for translator in translators:
-                            work.written_by(translator)
-                            translator.wrote(work)
-
-                    if r.Genre:
-                        work.has_genre(r.Genre.strip())
-                    
-
-                    self.translations[id] = work
-
-                translation = self.translations[id]
-                issue.includes(translation)
-
-                
+        if self.columnar:
+            from spatrem.columns import read_translation_rows
+            rows = read_translation_rows(infile, self.stats, self.pipelined)
+            with self.building(), self._phase("entities"):
+                for row in rows:
+                    self.import_translation_row(row)
+            return
+        records = self._records(infile, TranslationRecord, self.translation_records)
+        with self.building(), self._phase("entities"):
+            for r in records:
+                self.import_translation_record(r)
+
+    def import_translation_record(self, r: TranslationRecord) -> None:
+        self.import_translation_row(translation_row(r))
+
+    def import_translation_row(self, row: TranslationRow) -> None:
+        j = row.journal
+        if j not in self.journals:
+            journal = Journal(j)
+            journal.has_identifier(j)
+            self.journals[j] = journal
+
+        journal: Journal = self.journals[j]
+
+        issue_id = row.issue_id
+        pubDate = row.pubDate
+
+        if issue_id and issue_id not in self.issues:
+            issue: Issue = Issue(identifier=issue_id,
+                                 volume=row.volume,
+                                 number=row.number,
+                                 pubDate=pubDate,
+                                 language_area=row.language_area)
+            self.issues[issue_id] = issue
+
+        issue: Issue = self.issues[issue_id]
+
+        journal.publishes(issue, row.year)
+
+        # anonymous persons are distinct per contribution
+        anon_key = f"Anon/{issue_id}/{row.title_id}"
+
+        translators = []
+        for id,name in row.translators.items():
+            if id not in self.nomena:
+                self.nomena[id] = Nomen(name, iri_key=id)
+
+            if id in self.translators:
+                if id == "Anon" and self.compact_anonymous:
+                    translator = self.translators[id].add(anon_key, name, self.nomena[id])
+                elif id == "Anon":
+                    translator = Translator(key=id, persName=name, iri_key=anon_key)
+                    translator.is_identified_by(self.nomena[id])
+                    self.nomena[id].identifies(translator)
+                    self.translators[id].append(translator)
+                else:
+                    translator = self.translators[id]
+            else:
+                translator = Translator(key=id, persName=name)
+                translator.is_identified_by(self.nomena[id])
+                self.nomena[id].identifies(translator)
+                if id == "Anon":
+                    self.translators["Anon"].append(translator)
+                else:
+                    self.translators[id] = translator
+            translators.append(translator)
+
+        if row.listed_translator:
+            id, name = row.listed_translator
+            if id != "NONE" and id not in self.nomena:
+                self.nomena[id] = Nomen(name, iri_key=id)
+
+        authors = []
+        for id,name in row.authors.items():
+            if id not in self.nomena:
+                self.nomena[id] = Nomen(name, iri_key=id)
+
+            if id in self.authors:
+                if id == "Anon" and self.compact_anonymous:
+                    author = self.authors[id].add(anon_key, name, self.nomena[id])
+                elif id == "Anon":
+                    author = Author(key=id, persName=name, iri_key=anon_key)
+                    author.is_identified_by(self.nomena[id])
+                    self.nomena[id].identifies(author)
+                    self.authors[id].append(author)
+                else:
+                    author = self.authors[id]
+            else:
+                author = Author(key=id, persName=name)
+                author.is_identified_by(self.nomena[id])
+                self.nomena[id].identifies(author)
+                if id == "Anon":
+                    self.authors["Anon"].append(author)
+                else:
+                    self.authors[id] = author
+            authors.append(author)
 
-    def import_translators_file(self, infile: Path) -> None:
-        with open(infile, mode="r", encoding="utf-8-sig") as data:
-            reader: DictReader = DictReader(data, delimiter=";")
-            for row in reader:
-                self.translator_records.append(TranslatorRecord(**row))
+        sl = [self._language(lang) for lang in row.sl]
+        tl = [self._language(lang) for lang in row.tl]
 
-            for r in self.translator_records:
-                name = r.Surname_Name.strip()
-                id = clean_id(name)
+        if row.title:
+            id = row.title_id
+            if id not in self.nomena:
+                self.nomena[id] = Nomen(row.title, iri_key=id)
 
-                if id not in self.translators:
-                    print(f"{id} not in translator list but should be.")
-                else:
-                    tlator = self.translators[id]
-                    pseudonyms = []
-                    if r.Pseudonyms != "NONE":
-                        stripped = [n.strip() for n in r.Pseudonyms.split(";")]
-                        pseudonyms = {clean_id(name): name for name in stripped if name != "NONE"}
-                        
-                        for id, name in pseudonyms.items():
-                            if id not in self.nomena:
-                                self.nomena[id] = Nomen(name)
-                                tlator.is_identified_by(self.nomena[id])
-                                self.nomena[id].identifies(tlator)
-                                
-                                
-                   # add spatrem-specific attributes
-                    if r.Year_Birth != "Missing":
-                        tlator.has_birth_year(r.Year_Birth.strip())
-                    if r.Year_Death != "Missing":
-                        tlator.has_death_year(r.Year_Death.strip())
-                    if r.Nationality != "Missing":
-                        nationalities = r.Nationality.split(";")
-                        for n in nationalities:
-                            tlator.has_nationality(n.strip())
-                    if r.Gender != "Missing":
-                        genders = r.Gender.split(";")
-                        for g in genders:
-                            tlator.has_gender(g.strip())
-                    if r.Language_area != "Missing":
-                        tlator.has_language_area(r.Language_area.strip())
-        
-
-                    
-    def journal_graph(self) -> BaseGraph:
-        g = BaseGraph().graph
-        for _,v in self.journals.items():
-            g += v.graph
-        return g
+            if id not in self.translations:
+                work = Translation(row.title, iri_key=id)
+                work.is_identified_by(self.nomena[id])
 
-    def issue_graph(self) -> BaseGraph:
-        g = BaseGraph().graph
-        for _,v in self.issues.items():
-            g += v.graph
-        return g
+                for lang in tl:
+                    work.has_language(lang)
 
-    def translator_graph(self) -> BaseGraph:
-        g = BaseGraph().graph
-        for _,v in self.translators.items():
-            if type(v) is list:
-                for translator in v:
-                    g += translator.graph
-            else:
-                g += v.graph
-        return g
-    
-    def author_graph(self) -> BaseGraph:
-        g = BaseGraph().graph
-        for _,v in self.authors.items():
-            if type(v) is list:
-                for author in v:
-                    g += author.graph
-            else:
-                g += v.graph
-        return g
-    
+                original = Original(iri_key=id)
+                self.originals.append(original)
 
-    def language_graph(self) -> BaseGraph:
-        g = BaseGraph().graph
-        for _,v in self.languages.items():
-            g += v.graph
-        return g
+                work.has_original(original)
 
-    def name_graph(self) -> BaseGraph:
-        g = BaseGraph().graph
-        for _,v in self.nomena.items():
-            g += v.graph
-        return g
+                for lang in sl:
+                    original.has_language(lang)
 
-    def translation_graph(self) -> BaseGraph:
-        g = BaseGraph().graph
-        for _,v in self.translations.items():
-            g += v.graph
-        return g
+                if authors:
+                    for author in authors:
+                        original.written_by(author)
+                        author.wrote(original)
 
+                if translators:
+                    for translator in translators:
+                        work.written_by(translator)
+                        translator.wrote(work)
 
-    def original_graph(self) -> BaseGraph:
-        g = BaseGraph().graph
-        for original in self.originals:
-            g += original.graph
+                if row.genre:
+                    work.has_genre(row.genre)
+
+                self.translations[id] = work
+
+            translation = self.translations[id]
+            issue.includes(translation)
+            if self.index:
+                self.index.add(id, issue_id, journal.label, pubDate, row.sl, row.tl,
+                               list(row.translators), list(row.authors))
+            if self.aggregates:
+                self.aggregates.add_translation(journal.label, pubDate, row.sl, row.tl,
+                                                list(row.translators))
+
+    def _language(self, lang: str) -> Language:
+        if lang not in self.languages:
+            language = Language(lang)
+            language.has_identifier(lang)
+            self.languages[lang] = language
+        return self.languages[lang]
+
+    def import_translators_file(self, infile: Path) -> None:
+        records = self._records(infile, TranslatorRecord, self.translator_records)
+        with self.building(), self._phase("entities"):
+            if self.translator_join:
+                self.translator_join.join(records, self._join_translator)
+                return
+            for r in records:
+                self.import_translator_record(r)
+
+    def import_translator_record(self, r: TranslatorRecord) -> None:
+        name = r.Surname_Name.strip()
+        id = clean_id(name)
+
+        if self.aggregates:
+            self.aggregates.add_translator(id, [g.strip() for g in r.Gender.split(";")],
+                                           [n.strip() for n in r.Nationality.split(";")])
+
+        if id not in self.translators:
+            logger.warning("%s not in translator list but should be.", id)
+        else:
+            pseudonyms = split_names(r.Pseudonyms) if r.Pseudonyms != "NONE" else {}
+            self._enrich_translator(self.translators[id], r, pseudonyms)
+
+    def _join_translator(self, key: str, r: TranslatorRecord, names: dict[str, str]) -> None:
+        if self.aggregates:
+            self.aggregates.add_translator(key, [g.strip() for g in r.Gender.split(";")],
+                                           [n.strip() for n in r.Nationality.split(";")])
+        self._enrich_translator(self.translators[key], r, names)
+
+    def _enrich_translator(self, tlator: Translator, r: TranslatorRecord,
+                           names: dict[str, str]) -> None:
+        """Add a translator record's names and attributes to tlator.
+
+        names maps the clean_id of each other name of the translator
+        (its pseudonyms) to the name.
+        """
+        for id, name in names.items():
+            if id not in self.nomena:
+                self.nomena[id] = Nomen(name, iri_key=id)
+                tlator.is_identified_by(self.nomena[id])
+                self.nomena[id].identifies(tlator)
+
+        # add spatrem-specific attributes
+        if r.Year_Birth != "Missing":
+            tlator.has_birth_year(r.Year_Birth.strip())
+        if r.Year_Death != "Missing":
+            tlator.has_death_year(r.Year_Death.strip())
+        if r.Nationality != "Missing":
+            nationalities = r.Nationality.split(";")
+            for n in nationalities:
+                tlator.has_nationality(n.strip())
+        if r.Gender != "Missing":
+            genders = r.Gender.split(";")
+            for g in genders:
+                tlator.has_gender(g.strip())
+        if r.Language_area != "Missing":
+            tlator.has_language_area(r.Language_area.strip())
+
+    def _category_graph(self, category: str, entities: Iterable[BaseGraph]) -> Graph:
+        """The graph of all triples in an export category.
+
+        With a shared store this is the category's graph in the store;
+        otherwise the entities' graphs are merged into a new graph.
+        """
+        self._write_anonymous()
+        if self.store:
+            return self.store.graph(category)
+        with self._phase("merging"):
+            g = BaseGraph().graph
+            for entity in entities:
+                g += entity.graph
         return g
 
+    def _graph(self, category: str) -> Graph:
+        """A graph for triples of category that no entity holds."""
+        return self.store.graph(category) if self.store else new_graph()
+
+    def _write_anonymous(self) -> None:
+        """Bring the graphs of compactly kept anonymous persons up to date."""
+        for persons in (self.translators["Anon"], self.authors["Anon"]):
+            if isinstance(persons, AnonymousPersons):
+                persons.write_triples()
 
-    def export(self, directory: Path):
+    def _persons(self, persons: dict) -> Iterable[BaseGraph]:
+        # anonymous persons are kept in a list under the "Anon" key,
+        # or as AnonymousPersons, which have a graph of their own
+        for v in persons.values():
+            if type(v) is list:
+                yield from v
+            else:
+                yield v
+
+    def type_graph(self) -> Graph:
+        return self.graph.graph
+
+    def journal_graph(self) -> Graph:
+        return self._category_graph("journals", self.journals.values())
+
+    def issue_graph(self) -> Graph:
+        return self._category_graph("issues", self.issues.values())
+
+    def translator_graph(self) -> Graph:
+        return self._category_graph("translators", self._persons(self.translators))
+
+    def author_graph(self) -> Graph:
+        return self._category_graph("authors", self._persons(self.authors))
+
+    def language_graph(self) -> Graph:
+        return self._category_graph("languages", self.languages.values())
+
+    def name_graph(self) -> Graph:
+        return self._category_graph("names", self.nomena.values())
+
+    def translation_graph(self) -> Graph:
+        return self._category_graph("translations", self.translations.values())
+
+    def original_graph(self) -> Graph:
+        return self._category_graph("originals", self.originals)
+
+
+    def categories(self) -> dict[str, Iterable[BaseGraph]]:
+        """The entities of each export category, keyed by category name."""
+        self._write_anonymous()
+        return {
+            "types": [self.graph],
+            "journals": self.journals.values(),
+            "issues": self.issues.values(),
+            "translators": self._persons(self.translators),
+            "authors": self._persons(self.authors),
+            "languages": self.languages.values(),
+            "names": self.nomena.values(),
+            "translations": self.translations.values(),
+            "originals": self.originals,
+        }
+
+    def export(self, directory: Path, format: str = "ttl", jobs: int = 1,
+               snapshot: bool = False, shard_size: Optional[ShardSize] = None,
+               fast_turtle: bool = False) -> None:
+        """Write one file per export category into directory.
+
+        format is "ttl" (Turtle), or "nt"/"nq" to stream N-Triples or
+        N-Quads without building merged category graphs.  With jobs > 1
+        the Turtle files are serialized concurrently in a pool of that
+        many processes; the output is the same as with jobs=1.  With
+        snapshot, a binary snapshot of all categories is written
+        alongside (see spatrem.snapshot), and an importer collecting
+        aggregates writes them here too.
+
+        With shard_size, each category is written in numbered shards of
+        at most that many triples or bytes, listed with their checksums
+        in a manifest (see spatrem.shards).  With fast_turtle, Turtle is
+        written by the spatrem Turtle writer rather than rdflib's
+        serializer; the files hold the same graphs but are laid out
+        differently (see spatrem.turtle).
+        """
+        check_format(format)
         if not directory.is_dir():
             raise OSError("directory not found")
 
-        self.graph.graph.serialize(destination= directory / Path("types.ttl"))
-        self.journal_graph().serialize(destination= directory / Path("journals.ttl"))
-        self.issue_graph().serialize(destination= directory / Path("issues.ttl"))
-        self.translator_graph().serialize(destination= directory / Path("translators.ttl"))
-        self.author_graph().serialize(destination= directory / Path("authors.ttl"))
-        # self.genre_graph().serialize(destination= directory / Path("genres.ttl"))
-        self.language_graph().serialize(destination= directory / Path("languages.ttl"))
-        self.name_graph().serialize(destination= directory / Path("names.ttl"))
-        self.translation_graph().serialize(destination= directory / Path("translations.ttl"))
-        self.original_graph().serialize(destination= directory / Path("originals.ttl"))
-
-d = Path("/Users/wulfmanc/Desktop/DE")
-datafile = Path("/Users/wulfmanc/projects/sm/spatrem/SpaTrEM_Database/Datasets/translations/DE_Translations.csv")
-tfile = Path("/Users/wulfmanc/projects/sm/spatrem/SpaTrEM_Database/Datasets/translators/DE_Translators.csv")
-i = Importer()
+        if self.aggregates:
+            self.aggregates.write(directory)
+
+        if self.stats:
+            self.stats.count_entities(entity for category, entities in self.categories().items()
+                                      if category != "types" for entity in entities)
+
+        if shard_size:
+            graphs = {category: self._category_graph(category, entities)
+                      for category, entities in self.categories().items()}
+            if snapshot:
+                self.write_snapshot(directory / SNAPSHOT, graphs)
+            with self._phase("serialization"):
+                shards = write_shards(directory, graphs, format, shard_size, jobs, fast_turtle)
+            if self.stats:
+                self.stats.triples.update({shard.file: shard.triples for shard in shards})
+            return
+
+        if format in ("nt", "nq"):
+            if snapshot:
+                self.write_snapshot(directory / SNAPSHOT)
+            self.stream_export(directory, format)
+            return
+
+        graphs = {category: self._category_graph(category, entities)
+                  for category, entities in self.categories().items()}
+        if snapshot:
+            self.write_snapshot(directory / SNAPSHOT, graphs)
+        files = {directory / f"{category}.ttl": g for category, g in graphs.items()}
+        if self.stats:
+            self.stats.triples.update({path.name: len(g) for path, g in files.items()})
+        with self._phase("serialization"):
+            if jobs > 1:
+                serialize_in_parallel(files, jobs, fast_turtle)
+            elif self.pipelined:
+                with Writer() as writer:
+                    for path, g in files.items():
+                        if fast_turtle:
+                            with writer.open(path) as out:
+                                write_turtle(out, g)
+                        else:
+                            # rdflib writes each subject to the stream as it goes
+                            with writer.open(path, binary=True) as out:
+                                g.serialize(destination=out, format="turtle")
+            else:
+                for path, g in files.items():
+                    if fast_turtle:
+                        with open(path, mode="w", encoding="utf-8") as out:
+                            write_turtle(out, g)
+                    else:
+                        g.serialize(destination=path)
+
+    def write_snapshot(self, path: Path, graphs: Optional[dict[str, Graph]] = None) -> None:
+        """Write a binary snapshot of the category graphs to path."""
+        if graphs is None:
+            graphs = {category: self._category_graph(category, entities)
+                      for category, entities in self.categories().items()}
+        with self._phase("serialization"):
+            count = write_snapshot(path, graphs)
+        if self.stats:
+            self.stats.triples[path.name] = count
+
+    def stream_export(self, directory: Path, format: str = "nt") -> None:
+        """Stream each category to directory as N-Triples or N-Quads.
+
+        Entities are walked one at a time and their triples written
+        straight to the category file, so no merged copy of a category
+        is ever held in memory.
+        """
+        writer = Writer() if self.pipelined else None
+        with writer or nullcontext():
+            for category, entities in self.categories().items():
+                if self.store:
+                    graphs = [self.store.graph(category)]
+                else:
+                    graphs = (entity.graph for entity in entities)
+                context = category_id(category) if format == "nq" else None
+                path = directory / f"{category}.{format}"
+                with self._phase("serialization"):
+                    count = stream_graphs(path, graphs, context, writer)
+                if self.stats:
+                    self.stats.triples[path.name] = count
@@ -0,0 +1,265 @@
+"""Incremental re-import driven by row fingerprints.
+
+An IncrementalBuild keeps a manifest in the output directory that
+records, for every input row, a fingerprint of the row and the
+triples the row contributed to each export category.  On the next
+run only added and changed rows are put through the row logic again;
+the contributions of unchanged rows are taken from the manifest,
+removed rows simply drop out, and only the category files whose
+triples changed are rewritten.
+
+This relies on deterministic IRIs: a row replayed on its own mints
+the same IRIs as it did in the full run.  A row's contribution also
+depends on whether it is the first row to mention a journal, issue,
+name, person, language or title (the first row creates the entity,
+later rows only link to it) and whether it is the first to put a
+translation in an issue (only that row adds the R67 part links), so
+each row's fingerprint is paired with the set of keys that were new
+when it was imported.  If that set changes, for instance because an
+earlier row mentioning the same title was removed, the row is
+replayed too.
+"""
+import hashlib
+import json
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+from pydantic import BaseModel
+from rdflib.store import TripleAddedEvent
+from spatrem.classes.base_graph import SharedStore, new_graph
+from spatrem.classes.crm import Language, Nomen
+from spatrem.classes.magazine import Journal, Issue, Translator, Author, Translation
+from spatrem.exporter import nt_line
+from spatrem.importer import (Importer, TranslationRecord, TranslatorRecord,
+                              clean_id, issue_key, read_records, split_names,
+                              split_languages)
+
+MANIFEST = "import-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def fingerprint(record: BaseModel) -> str:
+    return hashlib.sha1(record.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def translation_keys(r: TranslationRecord) -> tuple[list[str], list[str]]:
+    """The entity keys a translation record creates if they are new.
+
+    Returns the keys and an (empty) list of keys it only looks up.
+    """
+    journal = r.Journal.strip()
+    issue_id, _, _ = issue_key(journal, r)
+    keys = [f"journals:{journal}", f"issues:{issue_id}"]
+    for role, field_ in (("translators", r.Translator), ("authors", r.Author)):
+        for id in split_names(field_):
+            keys.append(f"nomena:{id}")
+            if id != "Anon":
+                keys.append(f"{role}:{id}")
+    if r.Listed_Translator:
+        id = clean_id(r.Listed_Translator)
+        if id != "NONE":
+            keys.append(f"nomena:{id}")
+    for lang in split_languages(r.SL) + split_languages(r.TL):
+        keys.append(f"languages:{lang}")
+    if r.Title:
+        id = clean_id(r.Title)
+        keys += [f"nomena:{id}", f"translations:{id}", f"parts:{issue_id}/{id}"]
+    return keys, []
+
+
+def translator_keys(r: TranslatorRecord) -> tuple[list[str], list[str]]:
+    """The keys a translator record creates, and the translator it looks up."""
+    keys = []
+    if r.Pseudonyms != "NONE":
+        keys = [f"nomena:{id}" for id in split_names(r.Pseudonyms)]
+    return keys, [f"translators:{clean_id(r.Surname_Name.strip())}"]
+
+
+@dataclass
+class RowEntry:
+    fingerprint: str
+    new_keys: list[str]
+    triples: dict[str, list[str]]
+
+
+@dataclass
+class BuildReport:
+    reused: int = 0
+    replayed: int = 0
+    removed: int = 0
+    rewritten: list[str] = field(default_factory=list)
+
+
+class TripleRecorder:
+    """Attribute the triples added to a SharedStore to the row being imported."""
+
+    def __init__(self, store: SharedStore) -> None:
+        self.store = store
+        self.current: Optional[list] = None
+        store.store.dispatcher.subscribe(TripleAddedEvent, self.added)
+
+    def added(self, event: TripleAddedEvent) -> None:
+        if self.current is not None:
+            self.current.append((event.triple, event.context))
+
+    @contextmanager
+    def row(self) -> Iterator[dict[str, list[str]]]:
+        """Collect the N-Triples lines added inside the block, by category."""
+        contribution: dict[str, list[str]] = {}
+        self.current = []
+        try:
+            yield contribution
+        finally:
+            added, self.current = self.current, None
+        categories = {g.identifier: c for c, g in self.store.graphs.items()}
+        lines: dict[str, set[str]] = {}
+        for triple, context in added:
+            # Memory.remove fires no event, so skip triples that were
+            # added and then removed again (e.g. SerialWork's F1_Work).
+            if triple in context:
+                lines.setdefault(categories[context.identifier], set()).add(nt_line(triple))
+        contribution.update({c: sorted(l) for c, l in lines.items()})
+
+
+class IncrementalBuild:
+    """Import translations and translators files into directory incrementally."""
+
+    def __init__(self, directory: Path) -> None:
+        if not directory.is_dir():
+            raise OSError("directory not found")
+        self.directory = directory
+        self.manifest_path = directory / MANIFEST
+        self.importer = Importer(shared_store=True, deterministic_ids=True)
+        self.recorder = TripleRecorder(self.importer.store)
+        self.seen: set[str] = set()
+
+    def load_manifest(self) -> dict[str, list[RowEntry]]:
+        if not self.manifest_path.exists():
+            return {}
+        manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return {role: [RowEntry(**entry) for entry in entries]
+                for role, entries in manifest["rows"].items()}
+
+    def save_manifest(self, rows: dict[str, list[RowEntry]]) -> None:
+        manifest = {"version": MANIFEST_VERSION,
+                    "rows": {role: [entry.__dict__ for entry in entries]
+                             for role, entries in rows.items()}}
+        self.manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    def run(self, translations_file: Path,
+            translators_file: Optional[Path] = None) -> BuildReport:
+        report = BuildReport()
+        old = self.load_manifest()
+        rows: dict[str, list[RowEntry]] = {}
+
+        records = read_records(translations_file, TranslationRecord)
+        rows["translations"] = self._import(records, old.get("translations", []),
+                                            translation_keys,
+                                            self.importer.import_translation_record,
+                                            report)
+        if translators_file:
+            records = read_records(translators_file, TranslatorRecord)
+            rows["translators"] = self._import(records, old.get("translators", []),
+                                               translator_keys,
+                                               self.importer.import_translator_record,
+                                               report)
+
+        old_triples = category_triples(old)
+        new_triples = category_triples(rows)
+        # the types are fixed, so types.ttl only has to exist
+        new_triples["types"] = old_triples["types"] = {
+            nt_line(t) for t in self.importer.type_graph()}
+        for category in self.importer.categories():
+            lines = new_triples.get(category, set())
+            path = self.directory / f"{category}.ttl"
+            if path.exists() and lines == old_triples.get(category, set()):
+                continue
+            graph = new_graph()
+            graph.parse(data="".join(sorted(lines)), format="nt")
+            graph.serialize(destination=path)
+            report.rewritten.append(category)
+
+        self.save_manifest(rows)
+        return report
+
+    def _import(self, records: list, old_entries: list[RowEntry], keys, import_record,
+                report: BuildReport) -> list[RowEntry]:
+        previous: dict[str, list[RowEntry]] = {}
+        for entry in old_entries:
+            previous.setdefault(entry.fingerprint, []).append(entry)
+
+        entries = []
+        fingerprints: Counter[str] = Counter()
+        for r in records:
+            creates, lookups = keys(r)
+            new_keys = sorted({k for k in creates + lookups if k not in self.seen})
+            known = [k for k in dict.fromkeys(creates + lookups) if k in self.seen]
+            self.seen.update(creates)
+
+            fp = fingerprint(r)
+            fingerprints[fp] += 1
+            cached = next((e for e in previous.get(fp, []) if e.new_keys == new_keys), None)
+            if cached:
+                previous[fp].remove(cached)
+                entries.append(cached)
+                report.reused += 1
+                continue
+
+            with self.importer.building():
+                for key in known:
+                    self._stand_in(key)
+                with self.recorder.row() as triples:
+                    import_record(r)
+            entries.append(RowEntry(fp, new_keys, triples))
+            report.replayed += 1
+
+        # identical rows share a fingerprint, so count the rows of each
+        # fingerprint that are gone rather than the fingerprints
+        old = Counter(entry.fingerprint for entry in old_entries)
+        report.removed += sum(max(0, count - fingerprints[fp]) for fp, count in old.items())
+        return entries
+
+    def _stand_in(self, key: str) -> None:
+        """Make an entity created by an unchanged row available for a replayed one.
+
+        Unchanged rows are not replayed, so the entities they created
+        are missing from the importer.  With deterministic IRIs an
+        entity rebuilt from its key has the same IRI; its own triples
+        are not recorded, as they belong to the row that created it.
+        """
+        category, id = key.split(":", 1)
+        if category == "parts":
+            # a link, not an entity: the row that made it already
+            # recorded its triples
+            return
+        entities = getattr(self.importer, category)
+        if id in entities:
+            return
+        if category == "journals":
+            entities[id] = Journal(id)
+        elif category == "issues":
+            entities[id] = Issue(identifier=id)
+        elif category == "nomena":
+            entities[id] = Nomen(id, iri_key=id)
+        elif category == "translators":
+            entities[id] = Translator(key=id, persName=id)
+        elif category == "authors":
+            entities[id] = Author(key=id, persName=id)
+        elif category == "languages":
+            entities[id] = Language(id)
+        elif category == "translations":
+            entities[id] = Translation(id, iri_key=id)
+
+
+def category_triples(rows: dict[str, list[RowEntry]]) -> dict[str, set[str]]:
+    """The union of the rows' contributions, by export category."""
+    triples: dict[str, set[str]] = {}
+    for entries in rows.values():
+        for entry in entries:
+            for category, lines in entry.triples.items():
+                triples.setdefault(category, set()).update(lines)
+    return triples
@@ -0,0 +1,141 @@
+"""Secondary indexes over the translations of an import.
+
+A TranslationIndex is filled while translation records are imported
+and answers questions like "all translations from German into Swedish
+published between 1950 and 1960" or "everything translator X
+published in journal Y" without serializing the data and querying it
+elsewhere.
+
+The unit of the index is an appearance: a translation (keyed by the
+clean_id of its title) in an issue.  A translation reprinted in
+another issue has one appearance per issue.  Issue attributes
+(journal, issue, year) are indexed per appearance; translation
+attributes (source and target languages, translators, authors) are
+those the translation was created with and are indexed for each of
+its appearances.  find intersects the matching sets, smallest first,
+and filters what is left by year, so a query costs roughly the size
+of its smallest index entry rather than the size of the import.
+"""
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import product
+from typing import Optional, Union
+
+
+@dataclass(frozen=True)
+class Appearance:
+    year: Optional[str]
+    journal: str
+    issue: str
+    translation: str
+
+
+@dataclass(frozen=True)
+class TranslationFacts:
+    pairs: tuple[tuple[str, str], ...]
+    translators: tuple[str, ...]
+    authors: tuple[str, ...]
+
+
+class TranslationIndex:
+    def __init__(self) -> None:
+        self.facts: dict[str, TranslationFacts] = {}
+        self.by_pair: dict[tuple[str, str], set[Appearance]] = {}
+        self.by_source: dict[str, set[Appearance]] = {}
+        self.by_target: dict[str, set[Appearance]] = {}
+        self.by_year: dict[str, set[Appearance]] = {}
+        self.by_journal: dict[str, set[Appearance]] = {}
+        self.by_issue: dict[str, set[Appearance]] = {}
+        self.by_translator: dict[str, set[Appearance]] = {}
+        self.by_author: dict[str, set[Appearance]] = {}
+        self.appearances: set[Appearance] = set()
+        self._years: Optional[list[str]] = None
+
+    def add(self, translation: str, issue: str, journal: str, year: Optional[str],
+            sl: list[str], tl: list[str], translators: list[str], authors: list[str]) -> None:
+        """Record that translation appears in issue.
+
+        The languages, translators and authors are only used the first
+        time translation is added, as the importer only uses them then.
+        """
+        if translation not in self.facts:
+            self.facts[translation] = TranslationFacts(tuple(product(sl, tl)),
+                                                       tuple(translators), tuple(authors))
+        facts = self.facts[translation]
+        appearance = Appearance(year, journal, issue, translation)
+        if appearance in self.appearances:
+            return
+        self.appearances.add(appearance)
+
+        entries = [(self.by_journal, journal), (self.by_issue, issue)]
+        if year is not None:
+            entries.append((self.by_year, year))
+            if year not in self.by_year:
+                self._years = None
+        entries += [(self.by_pair, pair) for pair in facts.pairs]
+        entries += [(self.by_source, sl) for sl in {sl for sl, _ in facts.pairs}]
+        entries += [(self.by_target, tl) for tl in {tl for _, tl in facts.pairs}]
+        entries += [(self.by_translator, key) for key in facts.translators]
+        entries += [(self.by_author, key) for key in facts.authors]
+        for index, key in entries:
+            index.setdefault(key, set()).add(appearance)
+
+    def years(self) -> list[str]:
+        """The distinct publication years, in order."""
+        if self._years is None:
+            self._years = sorted(self.by_year)
+        return self._years
+
+    def _in_years(self, start: Optional[str], end: Optional[str]) -> set[Appearance]:
+        years = self.years()
+        first = 0 if start is None else bisect_left(years, start)
+        last = len(years) if end is None else bisect_right(years, end)
+        result: set[Appearance] = set()
+        for year in years[first:last]:
+            result |= self.by_year[year]
+        return result
+
+    def find(self, sl: Optional[str] = None, tl: Optional[str] = None,
+             start: Union[int, str, None] = None, end: Union[int, str, None] = None,
+             journal: Optional[str] = None, issue: Optional[str] = None,
+             translator: Optional[str] = None,
+             author: Optional[str] = None) -> list[Appearance]:
+        """The appearances matching every given criterion, in date order.
+
+        sl and tl are languages as written in the SL and TL columns,
+        start and end bound the publication year (inclusive), and
+        translator and author are person keys (clean_ids of names).
+        """
+        matches: list[set[Appearance]] = []
+        if sl is not None and tl is not None:
+            matches.append(self.by_pair.get((sl, tl), set()))
+        elif sl is not None:
+            matches.append(self.by_source.get(sl, set()))
+        elif tl is not None:
+            matches.append(self.by_target.get(tl, set()))
+        for index, key in ((self.by_journal, journal), (self.by_issue, issue),
+                           (self.by_translator, translator), (self.by_author, author)):
+            if key is not None:
+                matches.append(index.get(key, set()))
+        start = None if start is None else str(start)
+        end = None if end is None else str(end)
+        dated = start is not None or end is not None
+
+        if not matches:
+            result = self._in_years(start, end) if dated else set(self.appearances)
+        else:
+            matches.sort(key=len)
+            result = set(matches[0])
+            for match in matches[1:]:
+                result.intersection_update(match)
+                if not result:
+                    break
+            if dated:
+                result = {a for a in result if a.year is not None
+                          and (start is None or a.year >= start)
+                          and (end is None or a.year <= end)}
+        return sorted(result, key=_date_order)
+
+
+def _date_order(appearance: Appearance) -> tuple:
+    return (appearance.year or "", appearance.journal, appearance.issue, appearance.translation)
@@ -0,0 +1,181 @@
+"""Reading and writing files in background threads.
+
+A sequential run reads the whole csv, builds all entities and then
+serializes the output, so on slow (network mounted) storage every read
+and write adds its latency to the run.  In a pipelined run the file
+I/O happens in threads connected to the importer by bounded queues:
+read_ahead reads the lines of an input file in batches while the rows
+already read are validated and turned into entities, and a Writer
+writes output files while the next ones are being serialized.  The
+queues are bounded, so neither side gets more than a few batches
+ahead of the other and memory stays flat.
+
+Entity construction is CPU bound and stays on the calling thread.
+The threads only do file I/O, which releases the GIL, so they overlap
+with it rather than competing for it.  An error in a thread is raised
+again in the calling thread.
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+QUEUE_SIZE = 16
+# characters of lines per batch read
+BATCH_SIZE = 1 << 16
+CHUNK_SIZE = 1 << 20
+
+_END = object()
+
+
+class _Stage(threading.Thread):
+    """A thread feeding or draining a bounded queue."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name=name, daemon=True)
+        self.queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.stopped = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def put(self, item: object) -> bool:
+        """Put item on the queue unless the stage is stopped first."""
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+
+class _Reader(_Stage):
+    def __init__(self, path: Path) -> None:
+        super().__init__(f"read {path.name}")
+        self.path = path
+
+    def run(self) -> None:
+        try:
+            with open(self.path, mode="r", encoding="utf-8-sig") as data:
+                while True:
+                    batch = data.readlines(BATCH_SIZE)
+                    if not batch or not self.put(batch):
+                        break
+        except BaseException as error:
+            self.error = error
+        finally:
+            self.put(_END)
+
+
+@contextmanager
+def read_ahead(path: Path) -> Iterator[Iterator[str]]:
+    """The lines of a text file, read in a background thread.
+
+    Used like open(path): the lines are the same, but the file is read
+    in batches ahead of the consumer.
+    """
+    reader = _Reader(path)
+    reader.start()
+
+    def lines() -> Iterator[str]:
+        while True:
+            batch = reader.queue.get()
+            if batch is _END:
+                if reader.error is not None:
+                    raise reader.error
+                return
+            yield from batch
+
+    try:
+        yield lines()
+    finally:
+        reader.stopped.set()
+        reader.join()
+
+
+class _PipedFile:
+    """A text (UTF-8) or binary file written by a Writer's thread."""
+
+    def __init__(self, writer: "Writer", path: Path, binary: bool = False) -> None:
+        self.writer = writer
+        self.path = path
+        self.binary = binary
+        self.buffer: list = []
+        self.size = 0
+
+    def write(self, data: Union[str, bytes]) -> int:
+        self.buffer.append(data)
+        self.size += len(data)
+        if self.size >= CHUNK_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if self.buffer:
+            if self.binary:
+                self.writer.send(self.path, b"".join(self.buffer))
+            else:
+                self.writer.send(self.path, "".join(self.buffer).encode("utf-8"))
+            self.buffer, self.size = [], 0
+
+    def close(self) -> None:
+        self.flush()
+        self.writer.send(self.path, None)
+
+    def __enter__(self) -> "_PipedFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class Writer(_Stage):
+    """Write files in a background thread.
+
+    open(path) returns a file-like object whose writes are queued and
+    written by the thread, in order; open(path, binary=True) one that
+    takes bytes, for serializers that write to a binary stream.  Leaving the with block waits for
+    every file to be written and closed.
+    """
+
+    def __init__(self) -> None:
+        super().__init__("writer")
+        self.files: dict[Path, BinaryIO] = {}
+
+    def __enter__(self) -> "Writer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.put(_END)
+        self.join()
+        for out in self.files.values():
+            out.close()
+        if self.error is not None and exc_info[0] is None:
+            raise self.error
+
+    def open(self, path: Path, binary: bool = False) -> _PipedFile:
+        return _PipedFile(self, path, binary)
+
+    def send(self, path: Path, data: Optional[bytes]) -> None:
+        if self.error is not None:
+            raise self.error
+        self.put((path, data))
+
+    def run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _END:
+                return
+            if self.error is not None:
+                continue
+            path, data = item
+            try:
+                if path not in self.files:
+                    self.files[path] = open(path, mode="wb")
+                if data is None:
+                    self.files.pop(path).close()
+                else:
+                    self.files[path].write(data)
+            except BaseException as error:
+                self.error = error
@@ -0,0 +1,37 @@
+"""Batched validation of csv rows.
+
+A RowDecoder validates rows in batches with a TypeAdapter over a list of
+records, so the loop runs inside pydantic-core.  A batch that fails is
+validated again row by row with the model itself, so an invalid row
+raises the same error as model(**row).
+"""
+from itertools import islice
+from typing import Iterable, Iterator
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+class RowDecoder:
+    """Validate DictReader rows as records of model, a batch at a time."""
+
+    def __init__(self, model: type[BaseModel], batch_size: int = 1024) -> None:
+        self.model = model
+        self.batch_size = batch_size
+        self.adapter = TypeAdapter(list[model])
+
+    def __call__(self, row: dict) -> BaseModel:
+        return self.model(**row)
+
+    def decode_all(self, rows: Iterable[dict]) -> Iterator[BaseModel]:
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            yield from self._decode_batch(batch)
+
+    def _decode_batch(self, batch: list[dict]) -> list[BaseModel]:
+        # A row with more fields than the header has a None key, which
+        # the model rejects as a keyword but a TypeAdapter would ignore.
+        if not any(None in row for row in batch):
+            try:
+                return self.adapter.validate_python(batch)
+            except ValidationError:
+                pass
+        return [self(row) for row in batch]
@@ -0,0 +1,171 @@
+"""Size-bounded shards of an export.
+
+A category written as one file (translations.ttl, names.ttl) can only
+be loaded by one loader process.  With a shard size, each category is
+split into numbered files, <category>-0001.ttl, <category>-0002.ttl
+and so on, that can be loaded in parallel, and a manifest.json next to
+them lists every shard with its category, triple count, size and
+sha256 checksum, so a loader can check a shard and retry just the one
+that failed.
+
+The size is a number of triples ("500000") or of bytes ("64MB").
+Triples are written subject by subject, in subject order, and all the
+triples of a subject go into the same shard, so a shard holds whole
+resources and the split is the same from one run to the next (with
+deterministic ids).  A shard is only larger than the limit when a
+single subject is.  For Turtle, the triples are counted as N-Triples,
+which repeat every subject and write every IRI in full and so take
+more bytes than the Turtle, and the @prefix header each Turtle shard
+starts with is taken off the limit, so Turtle shards stay within a
+byte limit too.
+"""
+import hashlib
+import json
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+from rdflib import Graph
+from rdflib.term import URIRef
+from spatrem.classes.base_graph import category_id
+from spatrem.exporter import check_format, nq_line, nt_line, serialize_turtle
+from spatrem.turtle import PREFIXES
+
+MANIFEST = "manifest.json"
+
+UNITS = {"b": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+
+
+@dataclass(frozen=True)
+class ShardSize:
+    limit: int
+    unit: str = "triples"
+
+    @classmethod
+    def parse(cls, text: str) -> "ShardSize":
+        """A shard size from "500000" (triples) or "64MB", "512k", "1G" (bytes)."""
+        match = re.fullmatch(r"\s*(\d+)\s*(?:([bkmg])b?)?\s*", text, re.IGNORECASE)
+        if not match or int(match.group(1)) == 0:
+            raise ValueError(f"not a shard size: {text!r}")
+        number, unit = match.groups()
+        if unit is None:
+            return cls(int(number))
+        return cls(int(number) * UNITS[unit.lower()], "bytes")
+
+
+@dataclass
+class Shard:
+    category: str
+    file: str
+    triples: int
+    bytes: int = 0
+    sha256: str = ""
+
+
+def shard_name(category: str, number: int, format: str) -> str:
+    return f"{category}-{number:04d}.{format}"
+
+
+def turtle_header_size() -> int:
+    """The bytes of the @prefix lines a Turtle shard starts with, at most.
+
+    The spatrem writer declares all of PREFIXES, rdflib's serializer
+    the ones a shard uses, which are among them.
+    """
+    return sum(len(f"@prefix {prefix}: <{namespace}> .\n".encode("utf-8"))
+               for prefix, namespace in PREFIXES.items()) + 1
+
+
+def subject_groups(graph: Graph, context: Optional[URIRef] = None) -> Iterator[list[tuple]]:
+    """The (line, triple) pairs of graph, one list per subject, in subject order.
+
+    Lines are N-Triples, or N-Quads in context if it is given.
+    """
+    for subject in sorted(set(graph.subjects()), key=str):
+        yield sorted((nt_line(t) if context is None else nq_line(t, context), t)
+                     for t in graph.triples((subject, None, None)))
+
+
+def split(graph: Graph, size: ShardSize,
+          context: Optional[URIRef] = None) -> Iterator[tuple[list, list[str]]]:
+    """The triples of each shard of graph, with their lines (see subject_groups).
+
+    An empty graph still has one, empty, shard.
+    """
+    triples: list = []
+    lines: list[str] = []
+    used = 0
+    shards = 0
+    for group in subject_groups(graph, context):
+        if size.unit == "bytes":
+            cost = sum(len(line.encode("utf-8")) for line, _ in group)
+        else:
+            cost = len(group)
+        if triples and used + cost > size.limit:
+            yield triples, lines
+            shards += 1
+            triples, lines, used = [], [], 0
+        lines += [line for line, _ in group]
+        triples += [triple for _, triple in group]
+        used += cost
+    if triples or not shards:
+        yield triples, lines
+
+
+def write_shards(directory: Path, graphs: dict[str, Graph], format: str, size: ShardSize,
+                 jobs: int = 1, fast_turtle: bool = False) -> list[Shard]:
+    """Write each category graph to directory in shards, and the manifest.
+
+    format is "ttl", "nt" or "nq".  With jobs > 1, Turtle shards are
+    serialized in a pool of that many processes, and with fast_turtle
+    by the spatrem Turtle writer (see spatrem.turtle).
+    """
+    check_format(format)
+    shards: list[Shard] = []
+    budget = size
+    if format == "ttl" and size.unit == "bytes":
+        budget = ShardSize(max(1, size.limit - turtle_header_size()), "bytes")
+    pool = ProcessPoolExecutor(max_workers=jobs) if format == "ttl" and jobs > 1 else None
+    futures: list[Future] = []
+    try:
+        for category, graph in graphs.items():
+            context = category_id(category) if format == "nq" else None
+            for number, (triples, lines) in enumerate(split(graph, budget, context), start=1):
+                name = shard_name(category, number, format)
+                path = directory / name
+                if format != "ttl":
+                    with open(path, mode="w", encoding="utf-8") as out:
+                        out.writelines(lines)
+                elif pool:
+                    futures.append(pool.submit(serialize_turtle, triples, str(path), fast_turtle))
+                else:
+                    serialize_turtle(triples, str(path), fast_turtle)
+                shards.append(Shard(category, name, len(triples)))
+        for future in futures:
+            future.result()
+    finally:
+        if pool:
+            pool.shutdown()
+
+    for shard in shards:
+        with open(directory / shard.file, "rb") as data:
+            shard.sha256 = hashlib.file_digest(data, "sha256").hexdigest()
+        shard.bytes = (directory / shard.file).stat().st_size
+    write_manifest(directory / MANIFEST, format, size, shards)
+    return shards
+
+
+def write_manifest(path: Path, format: str, size: ShardSize, shards: list[Shard]) -> None:
+    document = {
+        "format": format,
+        "shard_size": asdict(size),
+        "shards": [asdict(shard) for shard in shards],
+    }
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def read_manifest(path: Path) -> list[Shard]:
+    """The shards listed in a manifest."""
+    document = json.loads(path.read_text(encoding="utf-8"))
+    return [Shard(**shard) for shard in document["shards"]]
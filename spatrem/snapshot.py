@@ -0,0 +1,185 @@
+"""A compact binary snapshot of an export.
+
+Re-reading the exported Turtle files to look something up means
+parsing all of them again, which is slow.  A snapshot holds the same
+triples in a form that loads quickly: every distinct term is stored
+once in a term table, and the triples of all categories are a single
+array of integers, four per triple (subject, predicate and object
+term numbers and the category number).
+
+Layout, after the magic bytes, zlib-compressed:
+
+    a header of five lengths (struct "<5Q")
+    the category names, NUL-separated utf-8
+    the term kinds, one byte per term
+    the term values (IRI, blank node id or literal lexical form),
+      NUL-separated utf-8
+    the literal languages or datatype IRIs, NUL-separated utf-8
+    the triples, little-endian unsigned 32-bit integers
+
+load_snapshot returns a Snapshot, which answers triple pattern
+lookups directly on the integer array and can rebuild rdflib graphs.
+"""
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.term import Node
+from spatrem.classes.base_graph import new_graph
+
+MAGIC = b"SPATREM-SNAPSHOT\x01"
+SNAPSHOT = "export.snapshot"
+HEADER = struct.Struct("<5Q")
+
+URI, BLANK, LITERAL, LANG_LITERAL, TYPED_LITERAL = range(5)
+
+
+def encode_term(term: Node) -> tuple[int, str, str]:
+    if isinstance(term, Literal):
+        if term.language:
+            return LANG_LITERAL, str(term), term.language
+        if term.datatype:
+            return TYPED_LITERAL, str(term), str(term.datatype)
+        return LITERAL, str(term), ""
+    if isinstance(term, BNode):
+        return BLANK, str(term), ""
+    return URI, str(term), ""
+
+
+def decode_term(kind: int, value: str, extra: str) -> Node:
+    if kind == URI:
+        return URIRef(value)
+    if kind == BLANK:
+        return BNode(value)
+    if kind == LANG_LITERAL:
+        return Literal(value, lang=extra)
+    if kind == TYPED_LITERAL:
+        return Literal(value, datatype=URIRef(extra))
+    return Literal(value)
+
+
+def _join(strings: Iterable[str]) -> bytes:
+    strings = list(strings)
+    if any("\0" in s for s in strings):
+        raise ValueError("snapshot strings cannot contain NUL")
+    return "\0".join(strings).encode("utf-8")
+
+
+def _split(data: bytes, count: int) -> list[str]:
+    return data.decode("utf-8").split("\0") if count else []
+
+
+def write_snapshot(path: Path, graphs: dict[str, Graph]) -> int:
+    """Write the triples of each category's graph to a snapshot at path.
+
+    Returns the number of triples written.
+    """
+    ids: dict[Node, int] = {}
+    quads = array("I")
+    for c, graph in enumerate(graphs.values()):
+        for triple in graph:
+            for term in triple:
+                quads.append(ids.setdefault(term, len(ids)))
+            quads.append(c)
+    if sys.byteorder == "big":
+        quads.byteswap()
+
+    encoded = [encode_term(term) for term in ids]
+    sections = [_join(graphs),
+                bytes(kind for kind, _, _ in encoded),
+                _join(value for _, value, _ in encoded),
+                _join(extra for _, _, extra in encoded),
+                quads.tobytes()]
+    header = HEADER.pack(*(len(section) for section in sections))
+    with open(path, mode="wb") as out:
+        out.write(MAGIC)
+        out.write(zlib.compress(header + b"".join(sections), 1))
+    return len(quads) // 4
+
+
+class Snapshot:
+    """The categories, terms and triples of a loaded snapshot."""
+
+    def __init__(self, categories: list[str], terms: list[Node], quads: array) -> None:
+        self.categories = categories
+        self.terms = terms
+        self.quads = quads
+        self._ids: Optional[dict[Node, int]] = None
+        self._columns: Optional[list[array]] = None
+
+    def __len__(self) -> int:
+        return len(self.quads) // 4
+
+    def id(self, term: Node) -> Optional[int]:
+        """The number of term in the term table, or None if it is not there."""
+        if self._ids is None:
+            self._ids = {t: n for n, t in enumerate(self.terms)}
+        return self._ids.get(term)
+
+    def triples(self, pattern: tuple[Optional[Node], Optional[Node], Optional[Node]],
+                categories: Optional[Iterable[str]] = None) -> Iterator[tuple[Node, Node, Node]]:
+        """The triples matching pattern (None is a wildcard), as rdflib terms."""
+        ids = []
+        for term in pattern:
+            n = None if term is None else self.id(term)
+            if term is not None and n is None:
+                return
+            ids.append(n)
+        ws, wp, wo = ids
+        wc = None
+        if categories is not None:
+            categories = set(categories)
+            wc = {n for n, c in enumerate(self.categories) if c in categories}
+
+        terms = self.terms
+        for s, p, o, c in zip(*self.columns()):
+            if ((ws is None or s == ws) and (wp is None or p == wp)
+                    and (wo is None or o == wo) and (wc is None or c in wc)):
+                yield terms[s], terms[p], terms[o]
+
+    def columns(self) -> list[array]:
+        """The subject, predicate, object and category numbers of the triples."""
+        if self._columns is None:
+            self._columns = [self.quads[n::4] for n in range(4)]
+        return self._columns
+
+    def subjects(self, predicate: Node, object: Node,
+                 categories: Optional[Iterable[str]] = None) -> Iterator[Node]:
+        for s, _, _ in self.triples((None, predicate, object), categories):
+            yield s
+
+    def objects(self, subject: Node, predicate: Node,
+                categories: Optional[Iterable[str]] = None) -> Iterator[Node]:
+        for _, _, o in self.triples((subject, predicate, None), categories):
+            yield o
+
+    def graph(self, categories: Optional[Iterable[str]] = None) -> Graph:
+        """An rdflib Graph of the triples of categories (by default, all)."""
+        graph = new_graph()
+        graph.addN((s, p, o, graph) for s, p, o in self.triples((None, None, None), categories))
+        return graph
+
+
+def load_snapshot(path: Path) -> Snapshot:
+    with open(path, mode="rb") as data:
+        if data.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a spatrem snapshot")
+        payload = zlib.decompress(data.read())
+
+    lengths = HEADER.unpack_from(payload)
+    sections = []
+    offset = HEADER.size
+    for length in lengths:
+        sections.append(payload[offset:offset + length])
+        offset += length
+    names, kinds, values, extras, triples = sections
+
+    quads = array("I")
+    quads.frombytes(triples)
+    if sys.byteorder == "big":
+        quads.byteswap()
+    terms = list(map(decode_term, kinds, _split(values, len(kinds)), _split(extras, len(kinds))))
+    return Snapshot(_split(names, len(names)), terms, quads)
@@ -0,0 +1,213 @@
+"""An rdflib store that keeps its triples in a SQLite database.
+
+A SharedStore normally keeps every triple in an in-memory rdflib
+Memory store, which indexes each triple three times over and soon
+outgrows a small machine.  SQLiteStore keeps the triples on disk
+instead: every distinct term is numbered once in a terms table (with
+the encoding of spatrem.snapshot), and a quad is four term numbers in
+a quads table.  Only the term numbering is held in memory.
+
+Adds are buffered and written with executemany every batch_size
+quads, and the transaction is committed every transaction_size
+quads, so a bulk import does not pay for a statement or a commit per
+triple.  The buffer is flushed before every read.
+
+A database left by an earlier run is cleared when the store is opened,
+so re-running an import with the same path does not add to the old
+triples; with resume=True its terms and quads are kept instead.
+"""
+import sqlite3
+from pathlib import Path
+from typing import Iterator, Optional
+from rdflib import Graph
+from rdflib.store import Store
+from rdflib.term import Node, URIRef
+from spatrem.snapshot import decode_term, encode_term
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY, kind INTEGER, value TEXT, extra TEXT);
+CREATE TABLE IF NOT EXISTS quads (
+    s INTEGER, p INTEGER, o INTEGER, c INTEGER,
+    PRIMARY KEY (c, s, p, o)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS quads_pos ON quads (p, o, c);
+CREATE INDEX IF NOT EXISTS quads_os ON quads (o, c);
+"""
+
+
+class SQLiteStore(Store):
+    context_aware = True
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, path: Path, batch_size: int = 10_000,
+                 transaction_size: int = 500_000, resume: bool = False) -> None:
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self.transaction_size = transaction_size
+        self.connection = sqlite3.connect(path)
+        # the database is a build artefact: trade durability for speed
+        self.connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = OFF;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -65536;
+        """)
+        self.connection.executescript(SCHEMA)
+        if not resume:
+            self.connection.executescript("DELETE FROM quads; DELETE FROM terms;")
+
+        self.terms: list[Optional[Node]] = [None]
+        self.ids: dict[Node, int] = {}
+        for id, kind, value, extra in self.connection.execute(
+                "SELECT id, kind, value, extra FROM terms ORDER BY id"):
+            term = decode_term(kind, value, extra)
+            self.terms.extend([None] * (id - len(self.terms)) + [term])
+            self.ids[term] = id
+        self.new_terms: list[tuple] = []
+        self.pending: dict[tuple[int, int, int, int], None] = {}
+        self.uncommitted = 0
+        self.graphs: dict[int, Graph] = {}
+        self.__namespace: dict[str, URIRef] = {}
+        self.__prefix: dict[URIRef, str] = {}
+
+    def _id(self, term: Node) -> int:
+        id = self.ids.get(term)
+        if id is None:
+            id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+            self.new_terms.append((id, *encode_term(term)))
+        return id
+
+    def _context(self, id: int) -> Graph:
+        if id not in self.graphs:
+            self.graphs[id] = Graph(store=self, identifier=self.terms[id])
+        return self.graphs[id]
+
+    def _flush(self) -> None:
+        if self.new_terms:
+            self.connection.executemany("INSERT INTO terms VALUES (?, ?, ?, ?)", self.new_terms)
+            self.new_terms = []
+        if self.pending:
+            self.connection.executemany("INSERT OR IGNORE INTO quads VALUES (?, ?, ?, ?)",
+                                        self.pending)
+            self.uncommitted += len(self.pending)
+            self.pending = {}
+        if self.uncommitted >= self.transaction_size:
+            self.connection.commit()
+            self.uncommitted = 0
+
+    def commit(self) -> None:
+        self._flush()
+        self.connection.commit()
+        self.uncommitted = 0
+
+    def close(self, commit_pending_transaction: bool = True) -> None:
+        if commit_pending_transaction:
+            self.commit()
+        self.connection.close()
+
+    def add(self, triple, context: Graph, quoted: bool = False) -> None:
+        Store.add(self, triple, context, quoted)
+        c = self._id(context.identifier)
+        self.graphs.setdefault(c, context)
+        s, p, o = triple
+        self.pending[(self._id(s), self._id(p), self._id(o), c)] = None
+        if len(self.pending) >= self.batch_size:
+            self._flush()
+
+    def _where(self, triple, context: Optional[Graph]) -> Optional[tuple[str, list[int]]]:
+        """The WHERE clause matching a triple pattern in context, or None if nothing can match."""
+        conditions, params = [], []
+        for column, term in zip("spo", triple):
+            if term is not None:
+                if term not in self.ids:
+                    return None
+                conditions.append(f"{column} = ?")
+                params.append(self.ids[term])
+        if context is not None:
+            if context.identifier not in self.ids:
+                return None
+            conditions.append("c = ?")
+            params.append(self.ids[context.identifier])
+        return " AND ".join(conditions) or "1", params
+
+    def remove(self, triple, context: Optional[Graph] = None) -> None:
+        where = self._where(triple, context)
+        if where is None:
+            return
+        # a single buffered triple is dropped without flushing the buffer
+        if None not in triple and context is not None:
+            s, p, o = triple
+            self.pending.pop((self.ids[s], self.ids[p], self.ids[o],
+                              self.ids[context.identifier]), None)
+        else:
+            self._flush()
+        self.connection.execute(f"DELETE FROM quads WHERE {where[0]}", where[1])
+
+    def triples(self, triple, context: Optional[Graph] = None) -> Iterator:
+        where = self._where(triple, context)
+        if where is None:
+            return
+        self._flush()
+        terms = self.terms
+        if context is not None:
+            cursor = self.connection.execute(
+                f"SELECT s, p, o FROM quads WHERE {where[0]}", where[1])
+            while rows := cursor.fetchmany(self.batch_size):
+                for s, p, o in rows:
+                    yield (terms[s], terms[p], terms[o]), iter([context])
+        else:
+            cursor = self.connection.execute(
+                f"SELECT s, p, o, group_concat(c) FROM quads WHERE {where[0]} GROUP BY s, p, o",
+                where[1])
+            while rows := cursor.fetchmany(self.batch_size):
+                for s, p, o, cs in rows:
+                    contexts = [self._context(int(c)) for c in cs.split(",")]
+                    yield (terms[s], terms[p], terms[o]), iter(contexts)
+
+    def __len__(self, context: Optional[Graph] = None) -> int:
+        self._flush()
+        if context is None:
+            query, params = "SELECT count(*) FROM (SELECT DISTINCT s, p, o FROM quads)", []
+        elif context.identifier not in self.ids:
+            return 0
+        else:
+            query, params = "SELECT count(*) FROM quads WHERE c = ?", [self.ids[context.identifier]]
+        return self.connection.execute(query, params).fetchone()[0]
+
+    def contexts(self, triple=None) -> Iterator[Graph]:
+        self._flush()
+        if triple is None or triple == (None, None, None):
+            rows = self.connection.execute("SELECT DISTINCT c FROM quads").fetchall()
+        else:
+            where = self._where(triple, None)
+            if where is None:
+                return
+            rows = self.connection.execute(
+                f"SELECT DISTINCT c FROM quads WHERE {where[0]}", where[1]).fetchall()
+        for (c,) in rows:
+            yield self._context(c)
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        bound_namespace = self.__namespace.get(prefix)
+        bound_prefix = self.__prefix.get(namespace)
+        if not override and (bound_namespace is not None or bound_prefix is not None):
+            return
+        if bound_prefix is not None:
+            del self.__namespace[bound_prefix]
+        if bound_namespace is not None:
+            del self.__prefix[bound_namespace]
+        self.__prefix[namespace] = prefix
+        self.__namespace[prefix] = namespace
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        return self.__namespace.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        return self.__prefix.get(namespace)
+
+    def namespaces(self) -> Iterator[tuple[str, URIRef]]:
+        yield from self.__namespace.items()
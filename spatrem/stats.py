@@ -0,0 +1,113 @@
+"""Per-phase instrumentation of an import.
+
+An Importer created with stats=True records, in a Stats object, the
+wall and CPU time spent in each phase of the run (csv parsing,
+validation, entity construction, merging category graphs and
+serialization), the number of rows read, the number of entities of
+each class and the number of triples written to each output file.
+Without it no hooks are installed, so a plain run pays nothing.
+
+Phases nest: time spent in an inner phase (parsing the csv while
+validating rows, say) is counted there and not in the outer one, so
+the phase times add up to the time of the run.
+"""
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar
+from spatrem.classes.magazine import AnonymousPersons
+
+T = TypeVar("T")
+
+
+@dataclass
+class Phase:
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.phases: dict[str, Phase] = {}
+        self.rows: Counter = Counter()
+        self.entities: Counter = Counter()
+        self.triples: dict[str, int] = {}
+        # wall and cpu time of the inner phases of each running phase
+        self._inner: list[list[float]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Count the time spent inside the block towards phase name."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        self._inner.append([0.0, 0.0])
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            inner_wall, inner_cpu = self._inner.pop()
+            phase = self.phases.setdefault(name, Phase())
+            phase.wall += wall - inner_wall
+            phase.cpu += cpu - inner_cpu
+            phase.calls += 1
+            if self._inner:
+                self._inner[-1][0] += wall
+                self._inner[-1][1] += cpu
+
+    def timed(self, items: Iterable[T], name: str) -> Iterator[T]:
+        """Iterate over items, counting the time to produce each towards name."""
+        items = iter(items)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+            yield item
+
+    def count_entities(self, entities: Iterable[object]) -> None:
+        """Count the entities of each class.
+
+        Compactly kept anonymous persons count as the Translators or
+        Authors they stand for.
+        """
+        self.entities = Counter()
+        for entity in entities:
+            if isinstance(entity, AnonymousPersons):
+                self.entities[entity.writer.__name__] += len(entity)
+            else:
+                self.entities[type(entity).__name__] += 1
+
+    def rows_per_second(self) -> float:
+        elapsed = sum(self.phases[name].wall for name in ("csv parsing", "validation", "entities")
+                      if name in self.phases)
+        return sum(self.rows.values()) / elapsed if elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "phases": {name: {"wall_s": p.wall, "cpu_s": p.cpu, "calls": p.calls}
+                       for name, p in self.phases.items()},
+            "rows": dict(self.rows),
+            "rows_per_s": self.rows_per_second(),
+            "entities": dict(sorted(self.entities.items())),
+            "triples": self.triples,
+        }
+
+    def write_json(self, path: Path) -> None:
+        path.write_text(json.dumps(self.as_dict(), indent=2) + "\n", encoding="utf-8")
+
+    def report(self) -> str:
+        lines = [f"{'phase':<16} {'wall s':>10} {'cpu s':>10}"]
+        for name, p in self.phases.items():
+            lines.append(f"{name:<16} {p.wall:>10.3f} {p.cpu:>10.3f}")
+        rows = ", ".join(f"{n} {kind}" for kind, n in self.rows.items())
+        lines.append(f"rows: {rows or 'none'} ({self.rows_per_second():,.0f} rows/s)")
+        lines.append("entities: " + ", ".join(f"{n} {name}"
+                                              for name, n in sorted(self.entities.items())))
+        for file, n in self.triples.items():
+            lines.append(f"{file}: {n} triples")
+        return "\n".join(lines)
@@ -0,0 +1,108 @@
+"""A Turtle writer for the fixed spatrem vocabulary.
+
+rdflib's Turtle serializer is general: it works out which prefixes a
+graph needs, counts references to nest blank nodes and orders
+everything it writes, all over the whole graph before the first line
+is out.  Spatrem exports use a fixed set of namespaces, have no blank
+nodes to nest and only need their triples grouped by subject, so
+write_turtle does just that: one pass to group the triples by subject,
+then each subject is written as a block of predicate-object lists.
+
+Subjects are written in order, the type first and the other predicates
+and objects in order, so the output is stable and easy to read.  IRIs
+in one of the known namespaces are written as prefixed names, others
+in full.  The output parses back to the same graph as rdflib's.
+"""
+import re
+from collections import defaultdict
+from operator import itemgetter
+from typing import Iterable, Optional, TextIO
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import RDF, RDFS, XSD
+from rdflib.term import Node
+from spatrem.classes.base_graph import BaseGraph
+
+PREFIXES: dict[str, str] = {
+    "rdf": str(RDF),
+    "rdfs": str(RDFS),
+    "xsd": str(XSD),
+    **{prefix: str(namespace) for prefix, namespace in BaseGraph.spatrem_namespaces.items()},
+}
+
+# a conservative subset of the PN_LOCAL production
+LOCAL_NAME = re.compile(r"(?:[A-Za-z0-9_](?:[A-Za-z0-9_.\-]*[A-Za-z0-9_\-])?)?")
+
+STRING_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+IRI_ESCAPES = str.maketrans({c: f"\\u{ord(c):04X}" for c in
+                             [chr(i) for i in range(0x21)] + list('<>"{}|^`\\')})
+
+
+class TurtleWriter:
+    def __init__(self, out: TextIO, prefixes: Optional[dict[str, str]] = None) -> None:
+        self.out = out
+        self.prefixes = PREFIXES if prefixes is None else prefixes
+        self.namespaces = {namespace: prefix for prefix, namespace in self.prefixes.items()}
+        self.iris: dict[URIRef, str] = {}
+        self.blank: dict[BNode, str] = {}
+
+    def iri(self, iri: URIRef) -> str:
+        text = self.iris.get(iri)
+        if text is None:
+            cut = max(iri.rfind("/"), iri.rfind("#")) + 1
+            prefix = self.namespaces.get(iri[:cut])
+            if prefix is not None and LOCAL_NAME.fullmatch(iri, cut):
+                text = f"{prefix}:{iri[cut:]}"
+            else:
+                text = f"<{iri.translate(IRI_ESCAPES)}>"
+            self.iris[iri] = text
+        return text
+
+    def term(self, term: Node) -> str:
+        if type(term) is URIRef:
+            return self.iri(term)
+        if isinstance(term, Literal):
+            text = f'"{term.translate(STRING_ESCAPES)}"'
+            if term.language:
+                return f"{text}@{term.language}"
+            if term.datatype:
+                return f"{text}^^{self.iri(term.datatype)}"
+            return text
+        if isinstance(term, BNode):
+            if term not in self.blank:
+                self.blank[term] = f"_:b{len(self.blank)}"
+            return self.blank[term]
+        return self.iri(URIRef(term))
+
+    def write_prefixes(self) -> None:
+        for prefix, namespace in sorted(self.prefixes.items()):
+            self.out.write(f"@prefix {prefix}: <{namespace}> .\n")
+        self.out.write("\n")
+
+    def write(self, triples: Iterable[tuple[Node, Node, Node]]) -> None:
+        """Write triples, grouped by subject."""
+        subjects: dict[Node, dict[str, list[str]]] = defaultdict(lambda: defaultdict(list))
+        term = self.term
+        for s, p, o in triples:
+            subjects[s]["a" if p == RDF.type else self.iri(p)].append(term(o))
+        blocks = sorted(((term(s), predicates) for s, predicates in subjects.items()),
+                        key=itemgetter(0))
+        write = self.out.write
+        for subject, predicates in blocks:
+            lines = []
+            for predicate in sorted(predicates, key=_predicate_order):
+                objects = ",\n        ".join(sorted(predicates[predicate]))
+                lines.append(f"{predicate} {objects}")
+            write(f"{subject} " + " ;\n    ".join(lines) + " .\n\n")
+
+
+def _predicate_order(predicate: str) -> tuple[bool, str]:
+    return (predicate != "a", predicate)
+
+
+def write_turtle(out: TextIO, triples: Iterable[tuple[Node, Node, Node]],
+                 prefixes: Optional[dict[str, str]] = None) -> None:
+    """Write triples to out as Turtle."""
+    writer = TurtleWriter(out, prefixes)
+    writer.write_prefixes()
+    writer.write(triples)
+
@@ -0,0 +1,221 @@
+"""Structural checks of an export.
+
+A Validator reads the triples of an export once, from the exported
+files or from an Importer's entities, and checks a declared set of
+constraints of the form
+
+    every <class> has a <predicate> link [to a <class>]
+
+for the classes of spatrem.classes.magazine: that every Translation is
+inspired by an Original, every Person is identified by a Nomen, every
+Issue is part of a Journal, and so on (see default_constraints).
+
+The triples are not kept.  While reading, the validator only records
+which subjects belong to the classes the constraints mention and the
+objects of the predicates they check, so memory is bounded by that
+index of subjects rather than by the size of the export.  rdflib's
+parsers hand each triple straight to the validator, N-Triples ones
+directly and the others through a store that keeps nothing.
+N-Triples and N-Quads are read line by line, but the Turtle parser
+reads a whole file into memory first, so large exports are best
+validated as nt or nq.
+"""
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+from rdflib import Graph
+from rdflib.namespace._RDF import RDF
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+from rdflib.store import Store
+from rdflib.term import Node, URIRef
+from spatrem.classes import CRM, LRM
+from spatrem.classes.magazine import types
+
+if TYPE_CHECKING:
+    from spatrem.importer import Importer
+
+# the rdflib parser of each exported file suffix
+PARSERS = {".ttl": "turtle", ".nt": "nt", ".nq": "nquads"}
+
+
+@dataclass(frozen=True)
+class ClassOf:
+    """The subjects with a predicate-object pair, such as rdf:type crm:E21_Person."""
+    name: str
+    predicate: URIRef
+    object: URIRef
+
+
+@dataclass(frozen=True)
+class Constraint:
+    """Every member of subject has a predicate link, to a member of target if given."""
+    subject: ClassOf
+    predicate: URIRef
+    target: Optional[ClassOf] = None
+
+    @property
+    def name(self) -> str:
+        local = self.predicate.split("/")[-1]
+        if self.target is None:
+            return f"{self.subject.name} {local}"
+        return f"{self.subject.name} {local} {self.target.name}"
+
+
+def typed(label: str) -> ClassOf:
+    """The entities of one of the magazine types (see magazine.types)."""
+    return ClassOf(label.capitalize(), LRM.P2_has_type, types[label].id)
+
+
+def default_constraints() -> list[Constraint]:
+    journal, issue = typed("journal"), typed("issue")
+    translation, original = typed("translation"), typed("original")
+    person = ClassOf("Person", RDF.type, CRM.E21_Person)
+    nomen = ClassOf("Nomen", RDF.type, LRM.F12_Nomen)
+    return [
+        Constraint(translation, LRM.R68_is_inspired_by, original),
+        Constraint(translation, CRM.P1_is_identified_by, nomen),
+        Constraint(translation, LRM.R67i_is_part_of, issue),
+        Constraint(original, LRM.R68_is_inspiration_for, translation),
+        Constraint(person, CRM.P1_is_identified_by, nomen),
+        Constraint(issue, LRM.R67i_is_part_of, journal),
+    ]
+
+
+@dataclass
+class Violation:
+    constraint: str
+    subject: str
+    problem: str
+
+
+@dataclass
+class ValidationReport:
+    triples: int = 0
+    checked: dict[str, int] = field(default_factory=dict)
+    violations: list[Violation] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def summary(self) -> str:
+        lines = [f"{self.triples} triples, {len(self.violations)} violations"]
+        for name, count in self.checked.items():
+            failed = sum(v.constraint == name for v in self.violations)
+            lines.append(f"{name}: {count} checked, {failed} failed")
+        lines += [f"{v.subject}: {v.problem} ({v.constraint})" for v in self.violations]
+        return "\n".join(lines)
+
+
+class _Sink(Store):
+    """A store that keeps nothing and hands every triple to a validator."""
+    context_aware = True
+    graph_aware = True
+
+    def __init__(self, validator: "Validator") -> None:
+        super().__init__()
+        self.validator = validator
+
+    def add(self, triple, context, quoted: bool = False) -> None:
+        self.validator.triple(*triple)
+
+    # the N-Quads parser adds and removes the graphs it parses into
+    def add_graph(self, graph: Graph) -> None:
+        pass
+
+    def remove_graph(self, graph: Graph) -> None:
+        pass
+
+
+class Validator:
+    def __init__(self, constraints: Optional[list[Constraint]] = None) -> None:
+        self.constraints = default_constraints() if constraints is None else constraints
+        classes = {c.subject for c in self.constraints}
+        classes |= {c.target for c in self.constraints if c.target is not None}
+        self.members: dict[ClassOf, set[Node]] = {cls: set() for cls in classes}
+        self._classes: dict[tuple[URIRef, URIRef], list[ClassOf]] = {}
+        for cls in classes:
+            self._classes.setdefault((cls.predicate, cls.object), []).append(cls)
+        self.links: dict[URIRef, dict[Node, set[Node]]] = {c.predicate: {} for c in self.constraints}
+        self.triples = 0
+
+    def triple(self, s: Node, p: Node, o: Node) -> None:
+        """Record one triple (the sink interface of rdflib's N-Triples parser)."""
+        self.triples += 1
+        for cls in self._classes.get((p, o), ()):
+            self.members[cls].add(s)
+        links = self.links.get(p)
+        if links is not None:
+            links.setdefault(s, set()).add(o)
+
+    def read(self, path: Path) -> None:
+        """Read the triples of an exported .ttl, .nt or .nq file."""
+        if path.suffix == ".nt":
+            # the N-Triples parser takes the validator as its sink directly
+            with open(path, mode="r", encoding="utf-8") as data:
+                W3CNTriplesParser(self).parse(data)
+            return
+        Graph(store=_Sink(self)).parse(path, format=PARSERS[path.suffix])
+
+    def read_directory(self, directory: Path) -> None:
+        """Read every exported file (or shard) in directory."""
+        for path in sorted(directory.iterdir()):
+            if path.suffix in PARSERS:
+                self.read(path)
+
+    def read_graph(self, graph: Graph) -> None:
+        for s, p, o in graph:
+            self.triple(s, p, o)
+
+    def read_graphs(self, graphs: Iterable[Graph]) -> None:
+        """Read graphs, reading a graph shared by several entities once."""
+        seen: set[int] = set()
+        for graph in graphs:
+            if id(graph) not in seen:
+                seen.add(id(graph))
+                self.read_graph(graph)
+
+    def read_importer(self, importer: "Importer") -> None:
+        """Read the entities of an import, as they would be exported."""
+        for category, entities in importer.categories().items():
+            if importer.store:
+                self.read_graph(importer.store.graph(category))
+            else:
+                self.read_graphs(entity.graph for entity in entities)
+
+    def report(self) -> ValidationReport:
+        report = ValidationReport(self.triples)
+        for constraint in self.constraints:
+            members = self.members[constraint.subject]
+            links = self.links[constraint.predicate]
+            targets = self.members[constraint.target] if constraint.target else None
+            report.checked[constraint.name] = len(members)
+            for subject in sorted(members):
+                objects = links.get(subject)
+                if not objects:
+                    problem = f"no {constraint.predicate.split('/')[-1]}"
+                elif targets is not None and objects.isdisjoint(targets):
+                    problem = f"links to no {constraint.target.name}"
+                else:
+                    continue
+                report.violations.append(Violation(constraint.name, str(subject), problem))
+        return report
+
+
+def validate_directory(directory: Path,
+                       constraints: Optional[list[Constraint]] = None) -> ValidationReport:
+    """Check the export in directory."""
+    validator = Validator(constraints)
+    validator.read_directory(directory)
+    return validator.report()
+
+
+def validate_importer(importer: "Importer",
+                      constraints: Optional[list[Constraint]] = None) -> ValidationReport:
+    """Check the entities of an import without exporting them."""
+    validator = Validator(constraints)
+    validator.read_importer(importer)
+    return validator.report()
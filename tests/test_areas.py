@@ -0,0 +1,31 @@
+from spatrem.areas import AreaImport, find_areas
+from tests.test_importer import DATA, import_sample
+
+
+def split_sample(directory):
+    """Write the sample as two language areas, one per journal.
+
+    The translators file goes with the second area, whose translations
+    do not list every translator in it.
+    """
+    header, *rows = (DATA / "translations.csv").read_text(encoding="utf-8").splitlines()
+    (directory / "DE_Translations.csv").write_text("\n".join([header] + rows[:4]) + "\n", encoding="utf-8")
+    (directory / "FR_Translations.csv").write_text("\n".join([header] + rows[4:]) + "\n", encoding="utf-8")
+    (directory / "FR_Translators.csv").write_bytes((DATA / "translators.csv").read_bytes())
+
+
+def test_find_areas(tmp_path):
+    split_sample(tmp_path)
+    assert find_areas(tmp_path) == {
+        "DE": (tmp_path / "DE_Translations.csv", None),
+        "FR": (tmp_path / "FR_Translations.csv", tmp_path / "FR_Translators.csv"),
+    }
+
+
+def test_merged_areas_match_a_single_import(tmp_path):
+    split_sample(tmp_path)
+    single = import_sample(deterministic_ids=True, shared_store=True)
+    for jobs in (1, 2):
+        merged = AreaImport(tmp_path, jobs=jobs).run()
+        for category in single.categories():
+            assert set(merged[category]) == set(single.store.graph(category))
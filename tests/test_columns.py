@@ -0,0 +1,32 @@
+import pytest
+from pydantic import ValidationError
+from spatrem.columns import read_translation_rows
+from spatrem.importer import TranslationRecord, read_records, translation_row
+from tests.test_importer import DATA, assert_same_export
+
+
+def test_columns_parse_like_records():
+    rows = list(read_translation_rows(DATA / "translations.csv"))
+    records = read_records(DATA / "translations.csv", TranslationRecord)
+    assert rows == [translation_row(r) for r in records]
+
+
+def test_columnar_export_matches_rows(tmp_path):
+    assert_same_export(tmp_path, {"deterministic_ids": True},
+                       {"deterministic_ids": True, "columnar": True})
+
+
+def test_irregular_rows_raise_the_model_errors(tmp_path):
+    data = tmp_path / "translations.csv"
+    data.write_text("Journal;Year;Issue_ID;Title\nDie Fähre;1946;DF_1;Die Killer\nDie Fähre\n",
+                    encoding="utf-8")
+    with pytest.raises(ValidationError) as expected:
+        list(read_records(data, TranslationRecord))
+    with pytest.raises(ValidationError) as raised:
+        list(read_translation_rows(data))
+    assert raised.value.errors() == expected.value.errors()
+
+
+def test_pipelined_columns_match():
+    rows = list(read_translation_rows(DATA / "translations.csv"))
+    assert list(read_translation_rows(DATA / "translations.csv", pipelined=True)) == rows
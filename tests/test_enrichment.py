@@ -0,0 +1,40 @@
+from rdflib import Literal
+from spatrem.classes import CRM, SPATREM
+from spatrem.enrichment import name_key
+from spatrem.importer import Importer
+from tests.test_importer import DATA
+
+HEADER = "Language_area;Surname_Name;Pseudonyms;Year_Birth;Year_Death;Nationality;Gender;Journals;Notes\n"
+
+
+def test_name_keys_ignore_case_accents_and_punctuation():
+    assert name_key("Hans Müller") == name_key("hans muller") == name_key("H-ANS MÜLLER.")
+
+
+def test_join_matches_names_and_pseudonyms(tmp_path, capsys):
+    importer = Importer(join_translators=True)
+    importer.import_translations_file(DATA / "translations.csv")
+    importer.import_translators_file(DATA / "translators.csv")
+    more = tmp_path / "more_translators.csv"
+    more.write_text(HEADER +
+                    "DE;hans muller;NONE;1901;1972;German;Male;NONE;NONE\n"
+                    "DE;Erich Schmitt;Erika Schmidt;1910;Missing;Austrian;Female;NONE;NONE\n"
+                    "DE;Doppel;\"Hans Müller; Erika Schmidt\";Missing;Missing;Missing;Missing;NONE;NONE\n"
+                    "DE;Nobody;NONE;Missing;Missing;Missing;Missing;NONE;NONE\n",
+                    encoding="utf-8")
+    importer.import_translators_file(more)
+    assert capsys.readouterr().out == ""
+
+    report = importer.translator_join.report
+    assert [(m.name, m.translator, m.via) for m in report.matched] == [
+        ("Hans Müller", "HansMüller", "name"),
+        ("Erika Schmidt", "ErikaSchmidt", "name"),
+        ("hans muller", "HansMüller", "name"),
+        ("Erich Schmitt", "ErikaSchmidt", "pseudonym"),
+    ]
+    assert report.missed == ["Kurt Unbekannt", "Nobody"]
+    assert report.ambiguous == {"Doppel": ["ErikaSchmidt", "HansMüller"]}
+
+    erika = importer.translators["ErikaSchmidt"]
+    assert (erika.id, SPATREM.nationality, Literal("Austrian")) in erika.graph
+    assert (erika.id, CRM.P1_is_identified_by, importer.nomena["ErichSchmitt"].id) in erika.graph
@@ -0,0 +1,23 @@
+from rdflib import Dataset, Graph, Literal
+from rdflib.namespace import XSD
+from spatrem.classes import SPATREM
+from spatrem.exporter import nq_line, nt_line
+
+
+def test_lines_match_rdflib_and_parse_back():
+    subject = SPATREM["abc"]
+    triples = [
+        (subject, SPATREM.note, Literal('say "hi"\\\nthen\r\tgo')),
+        (subject, SPATREM.note, Literal("Fähre", lang="de")),
+        (subject, SPATREM.span, Literal("P1946Y", datatype=XSD.duration)),
+        (subject, SPATREM.link, SPATREM["graph/journals"]),
+    ]
+    graph = Graph()
+    for triple in triples:
+        graph.add(triple)
+    lines = sorted(nt_line(t) for t in triples)
+    assert "".join(lines) == "".join(sorted(graph.serialize(format="nt").splitlines(keepends=True)))
+
+    context = SPATREM["graph/names"]
+    dataset = Dataset().parse(data="".join(nq_line(t, context) for t in triples), format="nquads")
+    assert set(dataset.graph(context)) == set(triples)
@@ -0,0 +1,239 @@
+import csv
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+import pytest
+from rdflib import Graph, RDF
+from spatrem.classes import CRM, LRM
+from spatrem.importer import Importer, TranslationRecord, read_records, translation_row
+from spatrem.snapshot import SNAPSHOT, load_snapshot
+
+DATA = Path(__file__).parent / "data"
+
+
+def import_sample(**kwargs) -> Importer:
+    importer = Importer(**kwargs)
+    importer.import_translations_file(DATA / "translations.csv")
+    importer.import_translators_file(DATA / "translators.csv")
+    return importer
+
+
+def export_sample(directory: Path, importer: dict, **export) -> Importer:
+    """Import the sample with the importer arguments and export it to a new directory."""
+    directory.mkdir(parents=True)
+    sample = import_sample(**importer)
+    sample.export(directory, **export)
+    return sample
+
+
+def assert_same_export(tmp_path: Path, baseline: dict, variant: dict,
+                       variant_export: Optional[dict] = None,
+                       same: Optional[Callable[[Path, Path], bool]] = None,
+                       **export) -> tuple[Importer, Importer]:
+    """Export the sample imported with the baseline and the variant arguments and compare.
+
+    The files of the two exports must be byte-identical, or the same by
+    same(baseline file, variant file).  variant_export overrides export
+    arguments for the variant.  Returns the two importers.
+    """
+    expected = export_sample(tmp_path / "baseline", baseline, **export)
+    actual = export_sample(tmp_path / "variant", variant, **{**export, **(variant_export or {})})
+    for path in (tmp_path / "baseline").iterdir():
+        other = tmp_path / "variant" / path.name
+        if same is None:
+            assert path.read_bytes() == other.read_bytes(), path.name
+        else:
+            assert same(path, other), path.name
+    return expected, actual
+
+
+def test_shared_store_matches_per_entity_graphs():
+    separate = import_sample()
+    for kwargs in ({"shared_store": True}, {"compact_anonymous": True},
+                   {"shared_store": True, "compact_anonymous": True}):
+        # the builders are complete before categories() is ever called
+        other = import_sample(**kwargs)
+        for builder in ("type_graph", "journal_graph", "issue_graph",
+                        "translator_graph", "author_graph", "language_graph",
+                        "name_graph", "translation_graph", "original_graph"):
+            assert len(getattr(other, builder)()) == len(getattr(separate, builder)()), (kwargs, builder)
+    shared = import_sample(shared_store=True)
+    translation = shared.translations["DieKiller"]
+    assert translation.graph is shared.translations["Romanze"].graph
+
+
+def test_streamed_ntriples_match_turtle(tmp_path):
+    importer = import_sample()
+    importer.export(tmp_path)
+    importer.export(tmp_path, format="nt")
+    for category in importer.categories():
+        turtle = Graph().parse(tmp_path / f"{category}.ttl")
+        ntriples = Graph().parse(tmp_path / f"{category}.nt", format="nt")
+        assert set(ntriples) == set(turtle)
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="xml"):
+        import_sample().export(tmp_path, format="xml")
+    assert not any(tmp_path.iterdir())
+
+
+def test_parallel_export_is_byte_identical(tmp_path):
+    assert_same_export(tmp_path, {"deterministic_ids": True}, {"deterministic_ids": True},
+                       variant_export={"jobs": 2})
+
+
+def test_deterministic_ids_are_reproducible(tmp_path):
+    assert_same_export(tmp_path, {"deterministic_ids": True},
+                       {"deterministic_ids": True, "shared_store": True})
+
+
+def test_streaming_keeps_no_records():
+    streamed = import_sample(streaming=True, deterministic_ids=True)
+    assert streamed.translation_records == []
+    assert streamed.translator_records == []
+    batch = import_sample(deterministic_ids=True)
+    assert len(batch.translation_records) == 8
+    assert set(streamed.translation_graph()) == set(batch.translation_graph())
+
+
+def test_stats_count_rows_entities_and_triples(tmp_path):
+    assert import_sample().stats is None
+    importer = import_sample(stats=True)
+    importer.export(tmp_path)
+    stats = importer.stats.as_dict()
+    assert stats["rows"] == {"translations.csv": 8, "translators.csv": 3}
+    assert stats["entities"]["Journal"] == 2
+    assert set(stats["phases"]) == {"csv parsing", "validation", "entities",
+                                    "merging", "serialization"}
+    for path in tmp_path.iterdir():
+        assert stats["triples"][path.name] == len(Graph().parse(path))
+    compact = import_sample(stats=True, compact_anonymous=True)
+    compact.export(tmp_path)
+    assert compact.stats.as_dict()["entities"] == stats["entities"]
+
+
+def test_snapshot_round_trips_the_export(tmp_path):
+    importer = import_sample()
+    importer.export(tmp_path, snapshot=True)
+    snapshot = load_snapshot(tmp_path / SNAPSHOT)
+    exported = Graph()
+    for category in importer.categories():
+        exported.parse(tmp_path / f"{category}.ttl")
+    assert set(snapshot.graph()) == set(exported)
+    names = Graph().parse(tmp_path / "names.ttl")
+    assert set(snapshot.graph(["names"])) == set(names)
+    persons = set(snapshot.subjects(RDF.type, CRM.E21_Person, ["translators"]))
+    assert persons == set(Graph().parse(tmp_path / "translators.ttl").subjects(RDF.type, CRM.E21_Person))
+
+
+def test_sqlite_store_matches_memory_store(tmp_path):
+    memory, sqlite = assert_same_export(
+        tmp_path, {"shared_store": True, "deterministic_ids": True},
+        {"sqlite": tmp_path / "store.sqlite", "deterministic_ids": True})
+    for category in memory.categories():
+        assert set(sqlite.store.graph(category)) == set(memory.store.graph(category))
+    sqlite.close()
+
+
+def test_sqlite_store_starts_afresh(tmp_path):
+    path = tmp_path / "store.sqlite"
+    counts = []
+    for run in range(2):
+        importer = import_sample(sqlite=path)
+        counts.append({category: len(importer.store.graph(category))
+                       for category in importer.categories()})
+        importer.close()
+    assert counts[0] == counts[1]
+
+
+def test_missing_translators_are_logged_not_printed(capsys, caplog):
+    import_sample()
+    assert capsys.readouterr().out == ""
+    assert [r.getMessage() for r in caplog.records] == \
+        ["KurtUnbekannt not in translator list but should be."]
+
+
+def test_importing_builds_nothing():
+    code = ("import spatrem.importer, spatrem.import_translators\n"
+            "from spatrem.classes.magazine import types\n"
+            "assert not types._types\n"
+            "assert not hasattr(spatrem.importer, 'i')\n")
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   cwd=Path(__file__).parent.parent)
+
+
+def test_index_finds_translations():
+    index = import_sample(index=True).index
+    assert [a.translation for a in index.find(sl="English", tl="German", start=1946, end=1947)] == \
+        ["DieKiller", "DaswüsteLand"]
+    assert [(a.translation, a.issue) for a in index.find(translator="HansMüller", journal="Lancelot")] == \
+        [("DieKiller", "Lancelot_6")]
+    assert [a.translation for a in index.find(sl="Latin")] == ["DerFriedhofamMeer"]
+    assert [a.issue for a in index.find(author="ErnestHemingway")] == ["Die Fähre_1_1", "Lancelot_6"]
+    assert index.find(tl="Swedish") == []
+    assert len(index.find(start=1948)) == 2
+
+
+def test_aggregates_are_written_with_the_export(tmp_path):
+    import_sample(aggregates=True).export(tmp_path)
+    aggregates = json.loads((tmp_path / "aggregates.json").read_text(encoding="utf-8"))
+    assert aggregates["translations_per_journal_year"] == [
+        {"Journal": "Die Fähre", "Year": "1946", "Translations": 3},
+        {"Journal": "Die Fähre", "Year": "1947", "Translations": 1},
+        {"Journal": "Lancelot", "Year": "1947", "Translations": 2},
+        {"Journal": "Lancelot", "Year": "1948", "Translations": 2},
+    ]
+    pairs = {(p["SL"], p["TL"]): p["Translations"] for p in aggregates["translations_per_language_pair"]}
+    assert pairs[("English", "German")] == 3
+    assert pairs[("Latin", "German")] == 1
+    assert aggregates["translations_per_translator_gender"] == [
+        {"Gender": "Female", "Translations": 2},
+        {"Gender": "Male", "Translations": 3},
+        {"Gender": "Unknown", "Translations": 3},
+    ]
+    with open(tmp_path / "translations_per_translator_nationality.csv", encoding="utf-8") as f:
+        assert list(csv.reader(f, delimiter=";")) == [
+            ["Nationality", "Translations"], ["Austrian", "2"], ["German", "5"], ["Unknown", "3"]]
+
+
+def test_pipelined_export_is_byte_identical(tmp_path):
+    for format in ("ttl", "nt"):
+        assert_same_export(tmp_path / format, {"deterministic_ids": True},
+                           {"deterministic_ids": True, "pipelined": True}, format=format)
+
+
+def test_compact_anonymous_persons_export_the_same_triples(tmp_path):
+    for shared_store in (False, True):
+        plain = {"deterministic_ids": True, "shared_store": shared_store}
+        _, importer = assert_same_export(tmp_path / f"shared{shared_store}", plain,
+                                         {**plain, "compact_anonymous": True})
+        assert len(importer.translators["Anon"]) + len(importer.authors["Anon"]) > 0
+
+
+def test_duplicated_rows_link_each_part_once_in_order(tmp_path):
+    rows = (DATA / "translations.csv").read_text(encoding="utf-8").splitlines(keepends=True)
+    csv_file = tmp_path / "translations.csv"
+    # every row twice, the copies in reverse order
+    csv_file.write_text("".join(rows + rows[:0:-1]), encoding="utf-8")
+    importer = Importer()
+    importer.import_translations_file(csv_file)
+    importer.export(tmp_path, format="nt")
+
+    records = [translation_row(r) for r in read_records(DATA / "translations.csv", TranslationRecord)]
+    journals = dict.fromkeys((r.journal, r.issue_id) for r in records)
+    parts = dict.fromkeys((r.issue_id, r.title_id) for r in records if r.title)
+    expected = [(importer.issues[issue].id, importer.translations[title].id) for issue, title in parts]
+    expected += [(importer.journals[journal].id, importer.issues[issue].id) for journal, issue in journals]
+    links = [line for path in tmp_path.glob("*.nt") for line in path.read_text(encoding="utf-8").splitlines()
+             if f"<{LRM.R67_has_part}>" in line]
+    assert sorted(links) == sorted(f"<{whole}> <{LRM.R67_has_part}> <{part}> ." for whole, part in expected)
+
+    for journal in importer.journals.values():
+        assert [i.id for i in journal.issues] == \
+            [importer.issues[issue].id for j, issue in journals if j == journal.label]
+        for issue in journal.issues:
+            assert [t.id for t in issue.constituents] == \
+                [importer.translations[title].id for i, title in parts if importer.issues[i] is issue]
@@ -0,0 +1,75 @@
+from pathlib import Path
+from rdflib import Graph
+from spatrem.importer import Importer
+from spatrem.incremental import IncrementalBuild
+
+DATA = Path(__file__).parent / "data"
+
+
+def test_unchanged_input_is_not_reimported(tmp_path):
+    first = IncrementalBuild(tmp_path).run(DATA / "translations.csv", DATA / "translators.csv")
+    assert first.reused == 0
+    second = IncrementalBuild(tmp_path).run(DATA / "translations.csv", DATA / "translators.csv")
+    assert second.replayed == 0
+    assert second.rewritten == []
+
+
+def test_changed_row_matches_full_import(tmp_path):
+    out, full = tmp_path / "out", tmp_path / "full"
+    out.mkdir()
+    full.mkdir()
+    csv = tmp_path / "translations.csv"
+    rows = (DATA / "translations.csv").read_text(encoding="utf-8").splitlines(keepends=True)
+    csv.write_text("".join(rows), encoding="utf-8")
+    IncrementalBuild(out).run(csv, DATA / "translators.csv")
+
+    del rows[1]
+    rows[2] = rows[2].replace("Das wüste Land", "Das öde Land")
+    csv.write_text("".join(rows), encoding="utf-8")
+    report = IncrementalBuild(out).run(csv, DATA / "translators.csv")
+    assert report.removed == 2
+    assert "journals" not in report.rewritten
+
+    importer = Importer(deterministic_ids=True)
+    importer.import_translations_file(csv)
+    importer.import_translators_file(DATA / "translators.csv")
+    importer.export(full)
+    for path in full.iterdir():
+        assert set(Graph().parse(path)) == set(Graph().parse(out / path.name))
+
+
+
+def test_removing_one_of_two_identical_rows_counts_as_removed(tmp_path):
+    csv = tmp_path / "translations.csv"
+    rows = (DATA / "translations.csv").read_text(encoding="utf-8").splitlines(keepends=True)
+    csv.write_text("".join(rows + rows[-1:]), encoding="utf-8")
+    IncrementalBuild(tmp_path).run(csv)
+
+    csv.write_text("".join(rows), encoding="utf-8")
+    report = IncrementalBuild(tmp_path).run(csv)
+    assert (report.replayed, report.removed) == (0, 1)
+
+
+def test_duplicate_row_keeps_its_links_when_the_original_is_removed(tmp_path):
+    out, full = tmp_path / "out", tmp_path / "full"
+    out.mkdir()
+    full.mkdir()
+    csv = tmp_path / "translations.csv"
+    rows = (DATA / "translations.csv").read_text(encoding="utf-8").splitlines(keepends=True)
+    [killer] = [row for row in rows if row.startswith("DE;Lancelot;1948;L_NONE_6;") and
+                ";Die Killer;" in row]
+    rows.append(killer)
+    csv.write_text("".join(rows), encoding="utf-8")
+    IncrementalBuild(out).run(csv, DATA / "translators.csv")
+
+    rows.remove(killer)
+    csv.write_text("".join(rows), encoding="utf-8")
+    report = IncrementalBuild(out).run(csv, DATA / "translators.csv")
+    assert report.removed == 1
+
+    importer = Importer(deterministic_ids=True)
+    importer.import_translations_file(csv)
+    importer.import_translators_file(DATA / "translators.csv")
+    importer.export(full)
+    for path in full.iterdir():
+        assert set(Graph().parse(path)) == set(Graph().parse(out / path.name)), path.name
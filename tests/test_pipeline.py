@@ -0,0 +1,33 @@
+import pytest
+from spatrem.pipeline import Writer, read_ahead
+
+
+def test_read_ahead_yields_the_lines(tmp_path):
+    path = tmp_path / "lines.txt"
+    lines = [f"line {i}\n" for i in range(100_000)]
+    path.write_text("".join(lines), encoding="utf-8")
+    with read_ahead(path) as data:
+        assert list(data) == lines
+    with read_ahead(path) as data:
+        assert next(iter(data)) == lines[0]
+
+
+def test_read_ahead_raises_reader_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        with read_ahead(tmp_path / "missing.txt") as data:
+            list(data)
+
+
+def test_writer_writes_files_in_order(tmp_path):
+    with Writer() as writer:
+        for name in ("a", "b", "empty"):
+            with writer.open(tmp_path / name) as out:
+                if name != "empty":
+                    for i in range(200_000):
+                        out.write(f"{name}{i}\n")
+        with writer.open(tmp_path / "bytes", binary=True) as out:
+            out.write("Fähre\n".encode("utf-8"))
+    assert (tmp_path / "a").read_text().splitlines()[-1] == "a199999"
+    assert len((tmp_path / "b").read_text().splitlines()) == 200_000
+    assert (tmp_path / "empty").read_text() == ""
+    assert (tmp_path / "bytes").read_text(encoding="utf-8") == "Fähre\n"
@@ -0,0 +1,21 @@
+import pytest
+from pydantic import ValidationError
+from spatrem.importer import TranslationRecord, decoders
+
+ROW = {"Journal": " Die Fähre ", "Year": "1946", "Issue_ID": "DF_1", "Vol": "NONE",
+       "No": " 2 ", "Translator": "NONE", "Title": "Die Killer "}
+
+
+def test_decoder_matches_the_model():
+    rows = [ROW, dict(ROW, Vol="3", Genre="Poetry")]
+    records = list(decoders[TranslationRecord].decode_all(rows))
+    assert records == [TranslationRecord(**row) for row in rows]
+
+
+def test_decoder_raises_the_model_errors():
+    bad = dict(ROW, Year=None)
+    with pytest.raises(ValidationError) as expected:
+        TranslationRecord(**bad)
+    with pytest.raises(ValidationError) as raised:
+        list(decoders[TranslationRecord].decode_all([ROW, bad]))
+    assert raised.value.errors() == expected.value.errors()
@@ -0,0 +1,52 @@
+import hashlib
+import pytest
+from rdflib import Graph
+from spatrem.shards import MANIFEST, ShardSize, read_manifest, write_shards
+from tests.test_importer import export_sample
+
+
+def test_shard_sizes_parse():
+    assert ShardSize.parse("500000") == ShardSize(500000)
+    assert ShardSize.parse("64MB") == ShardSize(64 << 20, "bytes")
+    assert ShardSize.parse("512k") == ShardSize(512 << 10, "bytes")
+    with pytest.raises(ValueError):
+        ShardSize.parse("lots")
+
+
+def test_unknown_shard_format_writes_nothing(tmp_path):
+    graph = Graph().parse(data="<urn:a> <urn:b> <urn:c> .", format="nt")
+    with pytest.raises(ValueError, match="json"):
+        write_shards(tmp_path, {"journals": graph}, "json", ShardSize(10))
+    assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("format, size, fast_turtle", [
+    ("ttl", ShardSize(20), False),
+    ("nt", ShardSize(2000, "bytes"), False),
+    ("ttl", ShardSize(800, "bytes"), True),
+])
+def test_shards_hold_the_export(tmp_path, format, size, fast_turtle):
+    whole, sharded = tmp_path / "whole", tmp_path / "sharded"
+    export_sample(whole, {"deterministic_ids": True}, format=format)
+    export_sample(sharded, {"deterministic_ids": True}, format=format, shard_size=size,
+                  fast_turtle=fast_turtle)
+
+    shards = read_manifest(sharded / MANIFEST)
+    assert len(shards) > len(list(whole.iterdir()))
+    for path in whole.iterdir():
+        category = path.stem
+        union = Graph()
+        for shard in shards:
+            if shard.category != category:
+                continue
+            data = (sharded / shard.file).read_bytes()
+            assert hashlib.sha256(data).hexdigest() == shard.sha256
+            assert len(data) == shard.bytes
+            graph = Graph().parse(sharded / shard.file)
+            assert len(graph) == shard.triples
+            if size.unit == "triples" and len(set(graph.subjects())) > 1:
+                assert shard.triples <= size.limit
+            if size.unit == "bytes" and len(set(graph.subjects())) > 1:
+                assert shard.bytes <= size.limit
+            union += graph
+        assert union.isomorphic(Graph().parse(path))
@@ -0,0 +1,14 @@
+from benchmarks.synthetic import Shape, write_dataset
+from spatrem.importer import Importer
+
+
+def test_synthetic_dataset_imports(tmp_path):
+    translations_file, translators_file = write_dataset(tmp_path, 200, Shape(translators=20))
+    assert translations_file.read_bytes() == write_dataset(tmp_path, 200, Shape(translators=20))[0].read_bytes()
+    importer = Importer(shared_store=True)
+    importer.import_translations_file(translations_file)
+    importer.import_translators_file(translators_file)
+    assert len(importer.translation_records) == 200
+    assert len(importer.translator_records) == len(importer.translators) - 1
+    assert len(importer.journals) == 17
+    assert importer.translators["Anon"]
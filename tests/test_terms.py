@@ -0,0 +1,30 @@
+from rdflib import Literal, URIRef
+from spatrem.classes import SPATREM
+from spatrem.classes.magazine import Issue, Translator
+from spatrem.classes.terms import literal
+
+
+def test_terms_are_shared():
+    assert SPATREM.genre is SPATREM.genre
+    assert SPATREM.genre == URIRef("http://spacesoftranslation.org/ns/spatrem/genre")
+    assert SPATREM["a"] is not SPATREM["a"]
+    assert literal("1946") is literal("1946")
+    assert literal("1946") == Literal("1946")
+
+
+def test_entities_use_shared_literals():
+    first = Translator(key="a", persName="A")
+    second = Translator(key="b", persName="B")
+    first.has_gender("Female")
+    second.has_gender("Female")
+    assert first.graph.value(first.id, SPATREM.gender) is second.graph.value(second.id, SPATREM.gender)
+
+
+def test_entity_identifiers_are_not_cached():
+    # the first entity of a class also builds its type, a vocabulary term
+    Translator(key="c", persName="C")
+    Issue("DF_1946_1")
+    before = literal.cache_info().currsize
+    Translator(key="d", persName="D")
+    Issue("DF_1946_2")
+    assert literal.cache_info().currsize == before
@@ -0,0 +1,32 @@
+import io
+from rdflib import Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDF, XSD
+from spatrem.classes import SPATREM
+from spatrem.turtle import write_turtle
+from tests.test_importer import assert_same_export
+
+
+def turtle(graph: Graph) -> Graph:
+    out = io.StringIO()
+    write_turtle(out, graph)
+    return Graph().parse(data=out.getvalue(), format="turtle")
+
+
+def test_odd_terms_round_trip():
+    graph = Graph()
+    subject = SPATREM["abc"]
+    graph.add((subject, RDF.type, SPATREM.Thing))
+    graph.add((subject, SPATREM.note, Literal('say "hi"\\\nthen\r\tgo')))
+    graph.add((subject, SPATREM.note, Literal("Fähre", lang="de")))
+    graph.add((subject, SPATREM.span, Literal("P1946Y", datatype=XSD.duration)))
+    graph.add((subject, SPATREM.link, URIRef("http://example.org/a%20b?c=é")))
+    graph.add((subject, SPATREM.link, SPATREM["graph/journals"]))
+    graph.add((SPATREM["x.y"], SPATREM.same, RDF.type))
+    assert isomorphic(turtle(graph), graph)
+
+
+def test_fast_turtle_export_matches_rdflib(tmp_path):
+    assert_same_export(tmp_path, {"deterministic_ids": True}, {"deterministic_ids": True},
+                       variant_export={"fast_turtle": True},
+                       same=lambda a, b: isomorphic(Graph().parse(a), Graph().parse(b)))
@@ -0,0 +1,38 @@
+import pytest
+from rdflib import Graph
+from spatrem.classes import CRM, LRM
+from spatrem.validation import validate_directory, validate_importer
+from tests.test_importer import import_sample
+
+
+@pytest.mark.parametrize("format", ["ttl", "nt", "nq"])
+def test_sample_export_is_valid(tmp_path, format):
+    importer = import_sample()
+    importer.export(tmp_path, format=format)
+    report = validate_directory(tmp_path)
+    assert report.ok, report.summary()
+    assert report == validate_importer(importer)
+
+
+def test_broken_links_are_reported(tmp_path):
+    importer = import_sample()
+    importer.export(tmp_path, format="nt")
+    translations = Graph().parse(tmp_path / "translations.nt")
+    translation, original = next(iter(translations.subject_objects(LRM.R68_is_inspired_by)))
+    translations.remove((translation, LRM.R68_is_inspired_by, None))
+    translations.remove((translation, LRM.R67i_is_part_of, None))
+    # a link to an entity of the wrong class
+    translations.add((translation, LRM.R67i_is_part_of, original))
+    translations.serialize(tmp_path / "translations.nt", format="nt")
+    persons = Graph().parse(tmp_path / "authors.nt")
+    person = next(iter(persons.subjects(CRM.P1_is_identified_by)))
+    persons.remove((person, CRM.P1_is_identified_by, None))
+    persons.serialize(tmp_path / "authors.nt", format="nt")
+
+    report = validate_directory(tmp_path)
+    assert not report.ok
+    assert {(v.constraint, v.subject, v.problem) for v in report.violations} == {
+        ("Translation R68_is_inspired_by Original", str(translation), "no R68_is_inspired_by"),
+        ("Translation R67i_is_part_of Issue", str(translation), "links to no Issue"),
+        ("Person P1_is_identified_by Nomen", str(person), "no P1_is_identified_by"),
+    }